@@ -8,6 +8,19 @@ import sqlite3
 import os
 from datetime import datetime
 
+from sqlite_conn import tuned_conn
+
+def _execute_in_savepoint(cursor, sql):
+    """Run a single statement inside a savepoint so a failure only undoes that statement"""
+    cursor.execute("SAVEPOINT migration_step")
+    try:
+        cursor.execute(sql)
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK TO migration_step")
+        cursor.execute("RELEASE migration_step")
+        raise
+    cursor.execute("RELEASE migration_step")
+
 def migrate_database():
     """Add deletion tracking columns to the reports table"""
     
@@ -19,91 +32,121 @@ def migrate_database():
         return False
     
     try:
-        # Connect to the database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        print("Connected to database successfully.")
-        
-        # Check if columns already exist
-        cursor.execute("PRAGMA table_info(reports)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        # Add new columns if they don't exist
-        new_columns = [
-            ("is_deleted", "BOOLEAN DEFAULT 0"),
-            ("deletion_reason", "VARCHAR(255)"),
-            ("deleted_at", "DATETIME")
-        ]
-        
-        for column_name, column_type in new_columns:
-            if column_name not in columns:
+        # Connect to the database; transactions are managed explicitly below.
+        # Closing the connection on any error discards the open transaction
+        with tuned_conn(db_path, isolation_level=None) as conn:
+            cursor = conn.cursor()
+            
+            print("Connected to database successfully.")
+            
+            # Run the whole DDL sequence in one transaction so SQLite syncs once
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Check if columns already exist (single probe, reused for verification below)
+            cursor.execute("PRAGMA table_info(reports)")
+            column_info = cursor.fetchall()
+            columns = {column[1] for column in column_info}
+            
+            # Add new columns if they don't exist
+            new_columns = [
+                ("is_deleted", "BOOLEAN DEFAULT 0"),
+                ("deletion_reason", "VARCHAR(255)"),
+                ("deleted_at", "DATETIME")
+            ]
+            missing_columns = [(name, col_type) for name, col_type in new_columns if name not in columns]
+            
+            for column_name, _ in new_columns:
+                if column_name in columns:
+                    print(f"✓ Column {column_name} already exists")
+            
+            # SQLite has no multi-column ADD or ADD COLUMN IF NOT EXISTS, so issue
+            # one ALTER per missing column inside the surrounding transaction
+            for column_name, column_type in missing_columns:
                 try:
                     alter_sql = f"ALTER TABLE reports ADD COLUMN {column_name} {column_type}"
-                    cursor.execute(alter_sql)
+                    _execute_in_savepoint(cursor, alter_sql)
                     print(f"✓ Added column: {column_name}")
                 except sqlite3.Error as e:
                     print(f"✗ Error adding column {column_name}: {e}")
-            else:
-                print(f"✓ Column {column_name} already exists")
-        
-        # Create new tables for citizen replies, ratings, and deletions
-        tables_to_create = [
-            """
-            CREATE TABLE IF NOT EXISTS citizen_replies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                report_id INTEGER NOT NULL,
-                message TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                is_admin_reply BOOLEAN DEFAULT 0,
-                admin_name VARCHAR(255)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS report_ratings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                report_id INTEGER NOT NULL,
-                rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
-                feedback TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS report_deletions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                report_id INTEGER NOT NULL,
-                reason VARCHAR(255) NOT NULL,
-                deleted_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        ]
-        
-        for table_sql in tables_to_create:
-            try:
-                cursor.execute(table_sql)
-                print("✓ Created/verified table successfully")
-            except sqlite3.Error as e:
-                print(f"✗ Error creating table: {e}")
-        
-        # Commit all changes
-        conn.commit()
-        print("\n✓ Database migration completed successfully!")
-        
-        # Verify the changes
-        print("\nVerifying changes...")
-        cursor.execute("PRAGMA table_info(reports)")
-        columns = cursor.fetchall()
-        print("Reports table columns:")
-        for column in columns:
-            print(f"  - {column[1]} ({column[2]})")
-        
-        # Check if new tables exist
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [table[0] for table in cursor.fetchall()]
-        print(f"\nAll tables: {', '.join(tables)}")
-        
-        return True
-        
+            
+            # Create new tables for citizen replies, ratings, and deletions
+            tables_to_create = [
+                """
+                CREATE TABLE IF NOT EXISTS citizen_replies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    report_id INTEGER NOT NULL,
+                    message TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    is_admin_reply BOOLEAN DEFAULT 0,
+                    admin_name VARCHAR(255)
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS report_ratings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    report_id INTEGER NOT NULL,
+                    rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
+                    feedback TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS report_deletions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    report_id INTEGER NOT NULL,
+                    reason VARCHAR(255) NOT NULL,
+                    deleted_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            ]
+            
+            for table_sql in tables_to_create:
+                try:
+                    _execute_in_savepoint(cursor, table_sql)
+                    print("✓ Created/verified table successfully")
+                except sqlite3.Error as e:
+                    print(f"✗ Error creating table: {e}")
+            
+            # Index report_id lookups up front (names match the SQLAlchemy models),
+            # plus a partial index for the soft-deleted subset of reports
+            indexes_to_create = [
+                "CREATE INDEX IF NOT EXISTS ix_citizen_replies_report_id ON citizen_replies (report_id)",
+                "CREATE INDEX IF NOT EXISTS ix_report_ratings_report_id ON report_ratings (report_id)",
+                "CREATE INDEX IF NOT EXISTS ix_report_deletions_report_id ON report_deletions (report_id)",
+                "CREATE INDEX IF NOT EXISTS idx_reports_deleted ON reports (is_deleted) WHERE is_deleted = 1",
+            ]
+            
+            for index_sql in indexes_to_create:
+                try:
+                    _execute_in_savepoint(cursor, index_sql)
+                    print("✓ Created/verified index successfully")
+                except sqlite3.Error as e:
+                    print(f"✗ Error creating index: {e}")
+            
+            # Commit all changes
+            cursor.execute("COMMIT")
+            print("\n✓ Database migration completed successfully!")
+            
+            # Verify the changes
+            print("\nVerifying changes...")
+            if missing_columns:
+                cursor.execute("PRAGMA table_info(reports)")
+                column_info = cursor.fetchall()
+            print("Reports table columns:")
+            print("\n".join(f"  - {column[1]} ({column[2]})" for column in column_info))
+            
+            # Check if new tables exist
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            tables = [table[0] for table in cursor.fetchall()]
+            print(f"\nAll tables: {', '.join(tables)}")
+            
+            # Refresh planner statistics: full ANALYZE the first time, then the cheap optimize pass
+            if "sqlite_stat1" not in tables:
+                cursor.execute("ANALYZE")
+            cursor.execute("PRAGMA optimize")
+            
+            return True
+
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return False
@@ -111,9 +154,7 @@ def migrate_database():
         print(f"Unexpected error: {e}")
         return False
     finally:
-        if conn:
-            conn.close()
-            print("Database connection closed.")
+        print("Database connection closed.")
 
 if __name__ == "__main__":
     print("CrowdCare Database Migration Script")
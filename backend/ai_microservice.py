@@ -4,10 +4,14 @@ Handles comprehensive urgency analysis using multiple factors
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
+import re
 from datetime import datetime
+from functools import lru_cache
+import numpy as np
 import uvicorn
 
 # Configure logging
@@ -16,6 +20,120 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="CrowdCare AI Microservice", version="1.0.0")
 
+# Static scoring tables, built once at import instead of per request
+_FACTOR_WEIGHTS = {
+    "category": 0.25,
+    "severity": 0.20,
+    "duration": 0.15,
+    "area": 0.15,
+    "time": 0.10,
+    "location": 0.10,
+    "content": 0.05
+}
+_FACTOR_ORDER = ("category", "severity", "duration", "area", "time", "location", "content")
+(_W_CATEGORY, _W_SEVERITY, _W_DURATION, _W_AREA,
+ _W_TIME, _W_LOCATION, _W_CONTENT) = (_FACTOR_WEIGHTS[factor] for factor in _FACTOR_ORDER)
+
+_CATEGORY_WEIGHTS = {
+    "Traffic Signal": 90,
+    "Waterlogging": 85,
+    "Pothole": 80,
+    "Road Issue": 75,
+    "Drainage": 70,
+    "Streetlight": 60,
+    "Garbage": 55,
+    "Sidewalk": 45,
+    "Other": 50
+}
+
+_SEVERITY_WEIGHTS = {
+    "Critical": 95,
+    "High": 80,
+    "Medium": 60,
+    "Low": 30
+}
+
+_DURATION_WEIGHTS = {
+    "Just noticed": 40,
+    "1 day": 50,
+    "1 week": 65,
+    "2 weeks": 75,
+    "1 month": 85,
+    "More than 1 month": 95
+}
+
+_AREA_WEIGHTS = {
+    "Few people": 30,
+    "Many people": 60,
+    "Entire area": 85,
+    "Traffic flow": 80,
+    "Pedestrians only": 40
+}
+
+# Keywords are stored lowercase; content is lowercased once per call
+_URGENT_KEYWORDS = frozenset([
+    "emergency", "urgent", "dangerous", "hazard", "accident", "injury",
+    "blocked", "flooded", "broken", "damaged", "collapsed", "leaking",
+    "fire", "gas", "electrical", "traffic", "pedestrian", "children"
+])
+
+_HIGH_IMPACT_KEYWORDS = frozenset([
+    "main road", "highway", "school", "hospital", "bridge", "tunnel",
+    "intersection", "crosswalk", "bus stop", "metro", "railway"
+])
+
+_TITLE_TEMPLATES = {
+    "Pothole": "{severity} Severity Pothole Report",
+    "Road Issue": "{severity} Road Infrastructure Issue",
+    "Traffic Signal": "{severity} Traffic Signal Malfunction",
+    "Waterlogging": "{severity} Waterlogging Issue",
+    "Streetlight": "{severity} Street Lighting Problem",
+    "Garbage": "{severity} Waste Management Issue",
+    "Sidewalk": "{severity} Pedestrian Infrastructure Issue",
+    "Drainage": "{severity} Drainage System Problem",
+    "Other": "{severity} Infrastructure Issue Report"
+}
+_DEFAULT_TITLE_TEMPLATE = "{severity} Infrastructure Issue"
+
+_DESCRIPTION_TEMPLATE = """INFRASTRUCTURE ISSUE REPORT
+
+ISSUE DETAILS:
+Category: {category}
+Severity: {severity}
+Duration: {duration}
+Area Affected: {affected_area}
+Report Date: {formatted_date}
+Report Time: {formatted_time}
+Location: {latitude:.6f}, {longitude:.6f}
+Reporter: {reporter}
+
+IMPACT ASSESSMENT:
+This {severity_lower} severity {category_lower} issue has been present for {duration_lower} and affects {affected_area_lower}. The issue requires appropriate attention based on its severity and impact.
+
+RECOMMENDED ACTIONS:
+Based on the severity level and category, appropriate departmental action is required to address this infrastructure issue.
+
+This report has been automatically generated and classified for administrative review."""
+
+# Major urban centres: Delhi, Mumbai, Bangalore, Chennai, Kolkata
+_URBAN_AREA_COORDS = np.array([
+    [28.6139, 77.2090],
+    [19.0760, 72.8777],
+    [12.9716, 77.5946],
+    [13.0827, 80.2707],
+    [22.5726, 88.3639],
+], dtype=np.float64)
+_URBAN_RADIUS_SQ = 0.5 ** 2  # ~50km, compared squared to skip the sqrt
+
+def _keyword_pattern(keywords: frozenset) -> "re.Pattern[str]":
+    """Compile a keyword set into one alternation (longest first, stable order)"""
+    ordered = sorted(keywords, key=lambda keyword: (-len(keyword), keyword))
+    return re.compile("|".join(map(re.escape, ordered)))
+
+# One alternation per keyword set so the content is scanned in a single pass
+_URGENT_RE = _keyword_pattern(_URGENT_KEYWORDS)
+_HIGH_IMPACT_RE = _keyword_pattern(_HIGH_IMPACT_KEYWORDS)
+
 class ClassificationRequest(BaseModel):
     report_content: Dict[str, Any]
     citizen_inputs: Dict[str, Any]
@@ -43,10 +161,12 @@ class SummaryResponse(BaseModel):
     description: str
     tags: list
 
-@app.post("/classify", response_model=ClassificationResponse)
+@app.post("/classify", response_model=ClassificationResponse, response_class=ORJSONResponse)
 async def classify_urgency(request: ClassificationRequest):
     """
-    Comprehensive urgency classification using multiple factors
+    Comprehensive urgency classification using multiple factors.
+    The response is serialized straight from a dict; ClassificationResponse
+    only documents its shape.
     """
     try:
         # Extract data from request
@@ -54,90 +174,92 @@ async def classify_urgency(request: ClassificationRequest):
         citizen_inputs = request.citizen_inputs
         location_context = request.location_context
         
-        # Analyze each factor
-        category_score = _analyze_category_urgency(report_content.get("category", "Other"))
-        severity_score = _analyze_severity_urgency(citizen_inputs.get("severity", "Medium"))
-        duration_score = _analyze_duration_urgency(citizen_inputs.get("duration", "1 day"))
-        area_score = _analyze_area_urgency(citizen_inputs.get("affected_area", "Few people"))
-        time_score = _analyze_time_urgency(location_context.get("reporting_time"))
-        location_score = _analyze_location_urgency(
+        # Identical inputs (retries, debounced resubmits) hit the cache
+        final_score, urgency_label, reasoning, scores = _classify_core(
+            report_content.get("category", "Other"),
+            citizen_inputs.get("severity", "Medium"),
+            citizen_inputs.get("duration", "1 day"),
+            citizen_inputs.get("affected_area", "Few people"),
+            location_context.get("reporting_time"),
             location_context.get("latitude", 0),
-            location_context.get("longitude", 0)
-        )
-        content_score = _analyze_content_urgency(
+            location_context.get("longitude", 0),
             report_content.get("title", ""),
             report_content.get("description", "")
         )
         
-        # Calculate weighted final score
-        weights = {
-            "category": 0.25,
-            "severity": 0.20,
-            "duration": 0.15,
-            "area": 0.15,
-            "time": 0.10,
-            "location": 0.10,
-            "content": 0.05
-        }
-        
-        final_score = int(
-            category_score * weights["category"] +
-            severity_score * weights["severity"] +
-            duration_score * weights["duration"] +
-            area_score * weights["area"] +
-            time_score * weights["time"] +
-            location_score * weights["location"] +
-            content_score * weights["content"]
-        )
-        
-        # Clamp score between 1-100
-        final_score = max(1, min(100, final_score))
-        
-        # Determine urgency label
-        if final_score >= 90:
-            urgency_label = "Critical"
-        elif final_score >= 75:
-            urgency_label = "High"
-        elif final_score >= 50:
-            urgency_label = "Medium"
-        elif final_score >= 25:
-            urgency_label = "Low"
-        else:
-            urgency_label = "Very Low"
-        
         # Calculate confidence based on data completeness
         confidence = _calculate_confidence(citizen_inputs, location_context)
         
-        # Generate detailed reasoning
-        reasoning = _generate_detailed_reasoning(
-            category_score, severity_score, duration_score, area_score,
-            time_score, location_score, content_score, final_score, urgency_label
-        )
-        
         # Prepare factors analyzed
-        factors_analyzed = {
-            "category_score": category_score,
-            "severity_score": severity_score,
-            "duration_score": duration_score,
-            "area_score": area_score,
-            "time_score": time_score,
-            "location_score": location_score,
-            "content_score": content_score,
-            "weights_applied": weights
-        }
+        factors_analyzed = {f"{factor}_score": score for factor, score in zip(_FACTOR_ORDER, scores)}
+        factors_analyzed["weights_applied"] = _FACTOR_WEIGHTS
         
-        return ClassificationResponse(
-            urgency_score=final_score,
-            urgency_label=urgency_label,
-            reasoning=reasoning,
-            confidence=confidence,
-            factors_analyzed=factors_analyzed
-        )
+        return ORJSONResponse({
+            "urgency_score": final_score,
+            "urgency_label": urgency_label,
+            "reasoning": reasoning,
+            "confidence": confidence,
+            "factors_analyzed": factors_analyzed
+        })
         
     except Exception as e:
         logger.error(f"Error in urgency classification: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Classification failed: {str(e)}")
 
+@app.post("/classify_batch", response_model=List[ClassificationResponse])
+async def classify_urgency_batch(requests: List[ClassificationRequest]):
+    """
+    Classify many reports at once (admin bulk imports / re-scoring).
+    Per-factor scores are gathered into one matrix and weighted in a single NumPy pass.
+    """
+    try:
+        if not requests:
+            return []
+        
+        factor_scores = np.array([
+            [
+                _analyze_category_urgency(req.report_content.get("category", "Other")),
+                _analyze_severity_urgency(req.citizen_inputs.get("severity", "Medium")),
+                _analyze_duration_urgency(req.citizen_inputs.get("duration", "1 day")),
+                _analyze_area_urgency(req.citizen_inputs.get("affected_area", "Few people")),
+                _analyze_time_urgency(req.location_context.get("reporting_time")),
+                _analyze_location_urgency(
+                    req.location_context.get("latitude", 0),
+                    req.location_context.get("longitude", 0)
+                ),
+                _analyze_content_urgency(
+                    req.report_content.get("title", ""),
+                    req.report_content.get("description", "")
+                ),
+            ]
+            for req in requests
+        ], dtype=np.int64)
+        
+        # Same left-to-right weighted sum as /classify, one column at a time
+        weighted = np.zeros(len(requests), dtype=np.float64)
+        for column, factor in enumerate(_FACTOR_ORDER):
+            weighted = weighted + factor_scores[:, column] * _FACTOR_WEIGHTS[factor]
+        final_scores = weighted.astype(np.int64).clip(1, 100)
+        
+        responses = []
+        for req, scores, final_score in zip(requests, factor_scores.tolist(), final_scores.tolist()):
+            urgency_label = _urgency_label(final_score)
+            factors_analyzed = {f"{factor}_score": score for factor, score in zip(_FACTOR_ORDER, scores)}
+            factors_analyzed["weights_applied"] = _FACTOR_WEIGHTS
+            responses.append(ClassificationResponse(
+                urgency_score=final_score,
+                urgency_label=urgency_label,
+                reasoning=_generate_detailed_reasoning(*scores, final_score, urgency_label),
+                confidence=_calculate_confidence(req.citizen_inputs, req.location_context),
+                factors_analyzed=factors_analyzed
+            ))
+        
+        return responses
+        
+    except Exception as e:
+        logger.error(f"Error in batch urgency classification: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch classification failed: {str(e)}")
+
 @app.post("/summarize", response_model=SummaryResponse)
 async def generate_summary(request: SummaryRequest):
     """
@@ -165,51 +287,24 @@ async def generate_summary(request: SummaryRequest):
 
 def _analyze_category_urgency(category: str) -> int:
     """Analyze category-based urgency (0-100)"""
-    category_weights = {
-        "Traffic Signal": 90,
-        "Waterlogging": 85,
-        "Pothole": 80,
-        "Road Issue": 75,
-        "Drainage": 70,
-        "Streetlight": 60,
-        "Garbage": 55,
-        "Sidewalk": 45,
-        "Other": 50
-    }
-    return category_weights.get(category, 50)
+    return _CATEGORY_WEIGHTS.get(category, 50)
 
 def _analyze_severity_urgency(severity: str) -> int:
     """Analyze severity-based urgency (0-100)"""
-    severity_weights = {
-        "Critical": 95,
-        "High": 80,
-        "Medium": 60,
-        "Low": 30
-    }
-    return severity_weights.get(severity, 60)
+    return _SEVERITY_WEIGHTS.get(severity, 60)
 
 def _analyze_duration_urgency(duration: str) -> int:
     """Analyze duration-based urgency (0-100)"""
-    duration_weights = {
-        "Just noticed": 40,
-        "1 day": 50,
-        "1 week": 65,
-        "2 weeks": 75,
-        "1 month": 85,
-        "More than 1 month": 95
-    }
-    return duration_weights.get(duration, 50)
+    return _DURATION_WEIGHTS.get(duration, 50)
 
 def _analyze_area_urgency(affected_area: str) -> int:
     """Analyze affected area urgency (0-100)"""
-    area_weights = {
-        "Few people": 30,
-        "Many people": 60,
-        "Entire area": 85,
-        "Traffic flow": 80,
-        "Pedestrians only": 40
-    }
-    return area_weights.get(affected_area, 50)
+    return _AREA_WEIGHTS.get(affected_area, 50)
+
+@lru_cache(maxsize=4096)
+def _parse_reporting_time(reporting_time: str) -> datetime:
+    """Parse an ISO timestamp once; shared by /classify and /summarize"""
+    return datetime.fromisoformat(reporting_time.replace('Z', '+00:00'))
 
 def _analyze_time_urgency(reporting_time: Optional[str]) -> int:
     """Analyze time-based urgency (0-100)"""
@@ -217,7 +312,7 @@ def _analyze_time_urgency(reporting_time: Optional[str]) -> int:
         return 50
         
     try:
-        report_time = datetime.fromisoformat(reporting_time.replace('Z', '+00:00'))
+        report_time = _parse_reporting_time(reporting_time)
         hour = report_time.hour
         weekday = report_time.weekday()
         
@@ -240,38 +335,19 @@ def _analyze_time_urgency(reporting_time: Optional[str]) -> int:
 def _analyze_location_urgency(latitude: float, longitude: float) -> int:
     """Analyze location-based urgency (0-100)"""
     # Urban areas have higher urgency
-    urban_areas = [
-        (28.6139, 77.2090),  # Delhi
-        (19.0760, 72.8777),  # Mumbai
-        (12.9716, 77.5946),  # Bangalore
-        (13.0827, 80.2707),  # Chennai
-        (22.5726, 88.3639),  # Kolkata
-    ]
-    
-    for city_lat, city_lon in urban_areas:
-        distance = ((latitude - city_lat) ** 2 + (longitude - city_lon) ** 2) ** 0.5
-        if distance < 0.5:  # Within ~50km
-            return 75  # Higher urgency in urban areas
+    diffs = _URBAN_AREA_COORDS - (latitude, longitude)
+    if (diffs * diffs).sum(axis=1).min() < _URBAN_RADIUS_SQ:
+        return 75  # Higher urgency in urban areas
     
     return 50  # Default for rural/unknown areas
 
 def _analyze_content_urgency(title: str, description: str) -> int:
     """Analyze content-based urgency (0-100)"""
-    urgent_keywords = [
-        "emergency", "urgent", "dangerous", "hazard", "accident", "injury",
-        "blocked", "flooded", "broken", "damaged", "collapsed", "leaking",
-        "fire", "gas", "electrical", "traffic", "pedestrian", "children"
-    ]
-    
-    high_impact_keywords = [
-        "main road", "highway", "school", "hospital", "bridge", "tunnel",
-        "intersection", "crosswalk", "bus stop", "metro", "railway"
-    ]
-    
     content = (title + " " + (description or "")).lower()
     
-    urgent_count = sum(1 for keyword in urgent_keywords if keyword in content)
-    impact_count = sum(1 for keyword in high_impact_keywords if keyword in content)
+    # Each keyword counts once, however often it appears
+    urgent_count = len(set(_URGENT_RE.findall(content)))
+    impact_count = len(set(_HIGH_IMPACT_RE.findall(content)))
     
     # Calculate content urgency score
     base_score = 50
@@ -280,6 +356,53 @@ def _analyze_content_urgency(title: str, description: str) -> int:
     
     return min(100, base_score + urgent_bonus + impact_bonus)
 
+@lru_cache(maxsize=1024)
+def _classify_core(category: str, severity: str, duration: str, affected_area: str,
+                   reporting_time: Optional[str], latitude: float, longitude: float,
+                   title: str, description: Optional[str]) -> tuple:
+    """Score, label, reasoning and per-factor scores for one set of (hashable) inputs"""
+    scores = (
+        _analyze_category_urgency(category),
+        _analyze_severity_urgency(severity),
+        _analyze_duration_urgency(duration),
+        _analyze_area_urgency(affected_area),
+        _analyze_time_urgency(reporting_time),
+        _analyze_location_urgency(latitude, longitude),
+        _analyze_content_urgency(title, description),
+    )
+    final_score = _compose_score(*scores)
+    urgency_label = _urgency_label(final_score)
+    reasoning = _generate_detailed_reasoning(*scores, final_score, urgency_label)
+    return final_score, urgency_label, reasoning, scores
+
+def _compose_score(category_score: int, severity_score: int, duration_score: int,
+                   area_score: int, time_score: int, location_score: int,
+                   content_score: int) -> int:
+    """Weighted sum of the factor scores, clamped to 1-100"""
+    final_score = int(
+        category_score * _W_CATEGORY +
+        severity_score * _W_SEVERITY +
+        duration_score * _W_DURATION +
+        area_score * _W_AREA +
+        time_score * _W_TIME +
+        location_score * _W_LOCATION +
+        content_score * _W_CONTENT
+    )
+    return max(1, min(100, final_score))
+
+def _urgency_label(final_score: int) -> str:
+    """Map a 1-100 urgency score to its label"""
+    if final_score >= 90:
+        return "Critical"
+    elif final_score >= 75:
+        return "High"
+    elif final_score >= 50:
+        return "Medium"
+    elif final_score >= 25:
+        return "Low"
+    else:
+        return "Very Low"
+
 def _calculate_confidence(citizen_inputs: Dict[str, Any], location_context: Dict[str, Any]) -> float:
     """Calculate confidence in the classification (0.0-1.0)"""
     confidence = 0.5  # Base confidence
@@ -339,25 +462,12 @@ def _generate_detailed_reasoning(category_score: int, severity_score: int, durat
 
 def _generate_title(category: str, severity: str) -> str:
     """Generate appropriate title based on category and severity"""
-    titles = {
-        "Pothole": f"{severity} Severity Pothole Report",
-        "Road Issue": f"{severity} Road Infrastructure Issue",
-        "Traffic Signal": f"{severity} Traffic Signal Malfunction",
-        "Waterlogging": f"{severity} Waterlogging Issue",
-        "Streetlight": f"{severity} Street Lighting Problem",
-        "Garbage": f"{severity} Waste Management Issue",
-        "Sidewalk": f"{severity} Pedestrian Infrastructure Issue",
-        "Drainage": f"{severity} Drainage System Problem",
-        "Other": f"{severity} Infrastructure Issue Report"
-    }
-    return titles.get(category, f"{severity} Infrastructure Issue")
+    return _TITLE_TEMPLATES.get(category, _DEFAULT_TITLE_TEMPLATE).format(severity=severity)
 
 def _generate_description(request: SummaryRequest) -> str:
     """Generate comprehensive description"""
-    from datetime import datetime
-    
     try:
-        report_datetime = datetime.fromisoformat(request.reporting_time.replace('Z', '+00:00'))
+        report_datetime = _parse_reporting_time(request.reporting_time)
         formatted_date = report_datetime.strftime("%B %d, %Y")
         formatted_time = report_datetime.strftime("%I:%M %p")
     except:
@@ -368,27 +478,21 @@ def _generate_description(request: SummaryRequest) -> str:
     duration = request.mcq_responses.get("duration", "1 day")
     affected_area = request.mcq_responses.get("affectedArea", "Local area")
     
-    description = f"""INFRASTRUCTURE ISSUE REPORT
-
-ISSUE DETAILS:
-Category: {request.category}
-Severity: {severity}
-Duration: {duration}
-Area Affected: {affected_area}
-Report Date: {formatted_date}
-Report Time: {formatted_time}
-Location: {request.latitude:.6f}, {request.longitude:.6f}
-Reporter: {request.reporter_name or "Citizen"}
-
-IMPACT ASSESSMENT:
-This {severity.lower()} severity {request.category.lower()} issue has been present for {duration.lower()} and affects {affected_area.lower()}. The issue requires appropriate attention based on its severity and impact.
-
-RECOMMENDED ACTIONS:
-Based on the severity level and category, appropriate departmental action is required to address this infrastructure issue.
-
-This report has been automatically generated and classified for administrative review."""
-    
-    return description
+    return _DESCRIPTION_TEMPLATE.format(
+        category=request.category,
+        severity=severity,
+        duration=duration,
+        affected_area=affected_area,
+        formatted_date=formatted_date,
+        formatted_time=formatted_time,
+        latitude=request.latitude,
+        longitude=request.longitude,
+        reporter=request.reporter_name or "Citizen",
+        severity_lower=severity.lower(),
+        category_lower=request.category.lower(),
+        duration_lower=duration.lower(),
+        affected_area_lower=affected_area.lower()
+    )
 
 def _generate_tags(category: str, mcq_responses: Dict[str, Any]) -> list:
     """Generate relevant tags"""
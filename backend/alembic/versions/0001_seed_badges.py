@@ -7,6 +7,8 @@ Create Date: 2025-09-05
 
 from alembic import op
 import sqlalchemy as sa
+import csv
+import io
 import json
 
 
@@ -94,34 +96,98 @@ BADGES = [
 
 
 def upgrade() -> None:
-    # Idempotent inserts: insert only if code not present
+    conn = op.get_bind()
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+        _seed_badges_copy(conn)
+    else:
+        _seed_badges_insert(conn)
+
+
+def _seed_badges_copy(conn) -> None:
+    # Stream the catalog through COPY into a staging table, then apply the
+    # same anti-join so re-running the seed stays idempotent
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for badge in BADGES:
+        writer.writerow(
+            [
+                badge["code"],
+                badge["name"],
+                badge["description"],
+                badge["tier"],
+                badge["icon_url"],
+                json.dumps(badge["criteria_json"]),
+            ]
+        )
+    buf.seek(0)
+
+    conn.execute(
+        sa.text(
+            """
+            CREATE TEMP TABLE badges_seed (
+                code text, name text, description text, tier integer, icon_url text, criteria_json jsonb
+            );
+            """
+        )
+    )
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            "COPY badges_seed (code, name, description, tier, icon_url, criteria_json) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+    finally:
+        cursor.close()
+    conn.execute(
+        sa.text(
+            """
+            INSERT INTO badges (code, name, description, tier, icon_url, criteria_json)
+            SELECT s.code, s.name, s.description, s.tier, s.icon_url, s.criteria_json
+            FROM badges_seed s
+            WHERE NOT EXISTS (SELECT 1 FROM badges b WHERE b.code = s.code);
+            """
+        )
+    )
+    conn.execute(sa.text("DROP TABLE badges_seed;"))
+
+
+def _seed_badges_insert(conn) -> None:
+    # Idempotent insert in one statement: all rows go in as a VALUES list and
+    # the anti-join skips codes that are already present
+    rows_sql = ",\n            ".join(
+        f"(:code_{i}, :name_{i}, :description_{i}, :tier_{i}, :icon_url_{i}, CAST(:criteria_json_{i} AS jsonb))"
+        for i in range(len(BADGES))
+    )
     insert_sql = sa.text(
-        """
+        f"""
         INSERT INTO badges (code, name, description, tier, icon_url, criteria_json)
-        SELECT :code, :name, :description, :tier, :icon_url, (:criteria_json)::jsonb
-        WHERE NOT EXISTS (SELECT 1 FROM badges WHERE code = :code);
+        SELECT v.code, v.name, v.description, v.tier, v.icon_url, v.criteria_json
+        FROM (VALUES
+            {rows_sql}
+        ) AS v(code, name, description, tier, icon_url, criteria_json)
+        WHERE NOT EXISTS (SELECT 1 FROM badges b WHERE b.code = v.code);
         """
     )
 
-    conn = op.get_bind()
-    for badge in BADGES:
-        conn.execute(
-            insert_sql,
+    params = {}
+    for i, badge in enumerate(BADGES):
+        params.update(
             {
-                "code": badge["code"],
-                "name": badge["name"],
-                "description": badge["description"],
-                "tier": badge["tier"],
-                "icon_url": badge["icon_url"],
-                "criteria_json": json.dumps(badge["criteria_json"]),
-            },
+                f"code_{i}": badge["code"],
+                f"name_{i}": badge["name"],
+                f"description_{i}": badge["description"],
+                f"tier_{i}": badge["tier"],
+                f"icon_url_{i}": badge["icon_url"],
+                f"criteria_json_{i}": json.dumps(badge["criteria_json"]),
+            }
         )
 
+    conn.execute(insert_sql, params)
+
 
 def downgrade() -> None:
     conn = op.get_bind()
-    delete_sql = sa.text("DELETE FROM badges WHERE code = :code")
-    for badge in BADGES:
-        conn.execute(delete_sql, {"code": badge["code"]})
-
-
+    delete_sql = sa.text("DELETE FROM badges WHERE code IN :codes").bindparams(
+        sa.bindparam("codes", expanding=True)
+    )
+    conn.execute(delete_sql, {"codes": [badge["code"] for badge in BADGES]})
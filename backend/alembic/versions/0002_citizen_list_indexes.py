@@ -0,0 +1,39 @@
+"""Index the citizen report list and report reply lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-09-20
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /citizen/reports: reporter's active reports, newest first. Partial on
+    # is_deleted = false since that is the only value the app queries for
+    op.create_index(
+        "ix_reports_citizen_list",
+        "reports",
+        ["reporter_id", sa.text("created_at DESC")],
+        postgresql_where=sa.text("is_deleted = false"),
+        sqlite_where=sa.text("is_deleted = 0"),
+    )
+    # GET /reports/{id}/replies: replies of one report in chronological order
+    op.create_index(
+        "ix_citizen_replies_report_created",
+        "citizen_replies",
+        ["report_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_citizen_replies_report_created", table_name="citizen_replies")
+    op.drop_index("ix_reports_citizen_list", table_name="reports")
@@ -0,0 +1,30 @@
+"""Index report comments by report and creation time
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-09-27
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /reports/{id}/comments: filter on report_id, ORDER BY created_at DESC
+    # (a backward scan of this index). Upvotes need no new index: the
+    # uq_report_upvote (report_id, user_id) constraint already provides one
+    op.create_index(
+        "ix_report_comments_report_created",
+        "report_comments",
+        ["report_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_report_comments_report_created", table_name="report_comments")
@@ -0,0 +1,32 @@
+"""Index active reports by location for duplicate detection
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-10-01
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # POST /reports/create duplicate check: ~30 m bounding box on latitude/longitude
+    # over active reports. Partial on is_deleted = false, the only value queried
+    op.create_index(
+        "idx_reports_active_geo",
+        "reports",
+        ["latitude", "longitude", "status"],
+        postgresql_where=sa.text("is_deleted = false"),
+        sqlite_where=sa.text("is_deleted = 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_reports_active_geo", table_name="reports")
@@ -9,10 +9,11 @@ Usage:
 """
 
 import argparse
-import os
-import sqlite3
+import shutil
 from pathlib import Path
 
+from sqlite_conn import tuned_conn
+
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 ROOT_DIR = SCRIPT_DIR.parent
@@ -26,8 +27,7 @@ UPLOADS_DIR = ROOT_DIR / "uploads"
 
 
 def purge_database(db_path: Path) -> None:
-    conn = sqlite3.connect(str(db_path))
-    try:
+    with tuned_conn(str(db_path)) as conn:
         conn.execute("PRAGMA foreign_keys = OFF;")
         cursor = conn.cursor()
 
@@ -43,33 +43,30 @@ def purge_database(db_path: Path) -> None:
             "reports",
         ]
 
-        for table in tables_in_order:
-            try:
-                cursor.execute(f"DELETE FROM {table};")
-            except sqlite3.OperationalError:
-                # Table may not exist; ignore
-                pass
+        # Probe once for the tables that exist instead of catching per-table errors
+        placeholders = ",".join("?" * len(tables_in_order))
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders});",
+            tables_in_order,
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+
+        statements = [f"DELETE FROM {table};" for table in tables_in_order if table in existing]
+        if statements:
+            # One transaction for every DELETE, so SQLite syncs once
+            conn.executescript("BEGIN;\n" + "\n".join(statements) + "\nCOMMIT;")
 
-        conn.commit()
-    finally:
-        conn.close()
+        # Row counts changed drastically; refresh planner statistics
+        conn.execute("PRAGMA optimize;")
 
 
 def purge_uploads(uploads_dir: Path) -> None:
     if not uploads_dir.exists():
         return
-    # Remove dated subdirectories/files under uploads, keep root dir
-    for root, dirs, files in os.walk(uploads_dir, topdown=False):
-        for name in files:
-            try:
-                Path(root, name).unlink()
-            except OSError:
-                pass
-        for name in dirs:
-            try:
-                Path(root, name).rmdir()
-            except OSError:
-                pass
+    # Remove the whole uploads tree in one call, then recreate the empty root.
+    # Errors propagate (e.g. uploads/ being a symlink) so a failed purge is not silent
+    shutil.rmtree(uploads_dir)
+    uploads_dir.mkdir(parents=True, exist_ok=True)
 
 
 def main() -> None:
@@ -3,71 +3,181 @@
 Create an admin user with department assignment for CrowdCare
 """
 
+import argparse
 import asyncio
+import csv
+import json
 import sys
 import os
-import hashlib
-import uuid
 
 # Add the backend directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import get_db, engine
+from database import engine
+from db_session import session_scope
 from models import Base, User, DepartmentCategory
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
+from password_hash import hash_password
+from id_utils import new_admin_ids
 
-def hash_password(password: str) -> str:
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+# Department name -> id, filled from listings and successful lookups
+_department_ids = {}
+
+def _department_id(db: Session, department_name: str):
+    """Resolve a department id by name, hitting the database only on a cache miss"""
+    department_id = _department_ids.get(department_name)
+    if department_id is None:
+        # lambda_stmt caches the compiled SQL; department_name is bound as a parameter
+        department_id = db.execute(lambda_stmt(
+            lambda: select(DepartmentCategory.id).where(DepartmentCategory.name == department_name)
+        )).scalar_one_or_none()
+        if department_id is not None:
+            _department_ids[department_name] = department_id
+    return department_id
+
+def _email_taken(db: Session, email: str) -> bool:
+    """True if a user with this email exists (cached-compilation single-column probe)"""
+    return db.execute(lambda_stmt(
+        lambda: select(User.id).where(User.email == email).limit(1)
+    )).first() is not None
 
 def create_admin_user(db: Session, email: str, password: str, full_name: str, 
-                     department_name: str, mobile_number: str = None) -> User:
+                     department_name: str, mobile_number: str = None,
+                     departments: list = None) -> User:
     """Create an admin user with department assignment"""
     
     # Check if department exists
-    department = db.query(DepartmentCategory).filter(
-        DepartmentCategory.name == department_name
-    ).first()
-    
-    if not department:
+    if _department_id(db, department_name) is None:
         print(f"❌ Department '{department_name}' not found!")
         print("Available departments:")
-        depts = db.query(DepartmentCategory).all()
-        for dept in depts:
-            print(f"  • {dept.name}")
+        depts = departments if departments is not None else db.query(DepartmentCategory).all()
+        print("\n".join(f"  • {dept.name}" for dept in depts))
         return None
     
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == email).first()
-    if existing_user:
+    if _email_taken(db, email):
         print(f"❌ User with email '{email}' already exists!")
         return None
     
     # Create admin user
-    admin_user = User(
-        id=str(uuid.uuid4()),
+    admin_user = _build_admin_user(email, password, full_name, department_name, mobile_number)
+    
+    db.add(admin_user)
+    db.commit()
+    db.refresh(admin_user)
+    
+    return admin_user
+
+def _build_admin_user(email: str, password: str, full_name: str,
+                      department_name: str, mobile_number: str = None) -> User:
+    """Build (but do not persist) an admin User row"""
+    user_id, admin_suffix = new_admin_ids()
+    return User(
+        id=user_id,
         email=email,
         password_hash=hash_password(password),
         full_name=full_name,
         mobile_number=mobile_number,
         role="admin",
-        admin_id=f"ADMIN_{uuid.uuid4().hex[:8].upper()}",
+        admin_id=f"ADMIN_{admin_suffix}",
         municipality_name="Default Municipality",
         department_name=department_name,
         is_active=True,
         is_verified=True
     )
+
+def create_admins_bulk(db: Session, rows: list) -> list:
+    """Create many admins with one department query, one email query and one bulk insert/commit.
+
+    Each row is a dict with email, password, full_name, department and optional mobile_number.
+    Invalid rows are reported and skipped.
+    """
+    department_names = {dept.name for dept in db.query(DepartmentCategory.name).all()}
     
-    db.add(admin_user)
-    db.commit()
-    db.refresh(admin_user)
+    # Every email already registered, fetched in a single IN query
+    emails = {(row.get("email") or "").strip() for row in rows} - {""}
+    taken_emails = {
+        email for (email,) in db.execute(select(User.email).where(User.email.in_(emails)))
+    } if emails else set()
     
-    return admin_user
+    admin_users = []
+    seen_emails = set()
+    for row in rows:
+        email = (row.get("email") or "").strip()
+        password = (row.get("password") or "").strip()
+        full_name = (row.get("full_name") or "").strip()
+        department_name = (row.get("department") or "").strip()
+        mobile_number = (row.get("mobile_number") or "").strip() or None
+        
+        if not email or not full_name or len(password) < 8:
+            print(f"❌ Skipping '{email}': email, full name and an 8+ char password are required")
+            continue
+        if department_name not in department_names:
+            print(f"❌ Skipping '{email}': department '{department_name}' not found")
+            continue
+        if email in seen_emails or email in taken_emails:
+            print(f"❌ Skipping '{email}': user already exists")
+            continue
+        
+        seen_emails.add(email)
+        admin_users.append(_build_admin_user(email, password, full_name, department_name, mobile_number))
+    
+    db.bulk_save_objects(admin_users)
+    db.commit()
+    return admin_users
+
+def _load_batch_rows(path: str) -> list:
+    """Read admin rows from a JSON list of objects or a CSV file with a header row"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            return json.load(f)
+        return list(csv.DictReader(f))
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create CrowdCare admin users")
+    parser.add_argument("--email", help="Admin email")
+    parser.add_argument("--password", help="Admin password (min 8 chars)")
+    parser.add_argument("--full-name", help="Admin full name")
+    parser.add_argument("--department", help="Department name")
+    parser.add_argument("--mobile", help="Mobile number (optional)")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="JSON or CSV file of admins (email, password, full_name, department, mobile_number)",
+    )
+    return parser.parse_args(argv)
 
 def main():
+    args = _parse_args()
+    
     print("CrowdCare Admin User Creation")
     print("=" * 40)
     
+    # Non-interactive modes for CI/seeding: --batch FILE, or a single admin from flags
+    if args.batch or args.email:
+        if args.batch:
+            rows = _load_batch_rows(args.batch)
+        else:
+            rows = [{
+                "email": args.email,
+                "password": args.password,
+                "full_name": args.full_name,
+                "department": args.department,
+                "mobile_number": args.mobile,
+            }]
+        try:
+            with session_scope() as db:
+                created = create_admins_bulk(db, rows)
+                print("\n".join(
+                    f"✅ {admin_user.email} → {admin_user.department_name} ({admin_user.admin_id})"
+                    for admin_user in created
+                ))
+            print(f"\nCreated {len(created)} of {len(rows)} admin users")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        return
+    
     # Get user input
     email = input("Enter admin email: ").strip()
     if not email:
@@ -86,52 +196,52 @@ def main():
     
     # Show available departments
     print("\nAvailable departments:")
-    db = next(get_db())
     try:
-        depts = db.query(DepartmentCategory).all()
-        for i, dept in enumerate(depts, 1):
-            print(f"  {i}. {dept.name}: {dept.description}")
-        
-        dept_choice = input(f"\nSelect department (1-{len(depts)}): ").strip()
-        try:
-            dept_index = int(dept_choice) - 1
-            if 0 <= dept_index < len(depts):
-                department_name = depts[dept_index].name
-            else:
-                print("❌ Invalid department choice!")
+        with session_scope() as db:
+            depts = db.query(DepartmentCategory).all()
+            _department_ids.update({dept.name: dept.id for dept in depts})
+            print("\n".join(f"  {i}. {dept.name}: {dept.description}" for i, dept in enumerate(depts, 1)))
+            
+            dept_choice = input(f"\nSelect department (1-{len(depts)}): ").strip()
+            try:
+                dept_index = int(dept_choice) - 1
+                if 0 <= dept_index < len(depts):
+                    department_name = depts[dept_index].name
+                else:
+                    print("❌ Invalid department choice!")
+                    return
+            except ValueError:
+                print("❌ Please enter a valid number!")
                 return
-        except ValueError:
-            print("❌ Please enter a valid number!")
-            return
-        
-        mobile_number = input("Enter mobile number (optional): ").strip() or None
-        
-        # Create admin user
-        print(f"\n🚀 Creating admin user for department: {department_name}")
-        admin_user = create_admin_user(db, email, password, full_name, department_name, mobile_number)
-        
-        if admin_user:
-            print("✅ Admin user created successfully!")
-            print(f"   ID: {admin_user.id}")
-            print(f"   Email: {admin_user.email}")
-            print(f"   Name: {admin_user.full_name}")
-            print(f"   Department: {admin_user.department_name}")
-            print(f"   Admin ID: {admin_user.admin_id}")
-            print(f"   Role: {admin_user.role}")
-            print(f"   Status: {'Active' if admin_user.is_active else 'Inactive'}")
-            print(f"   Verified: {'Yes' if admin_user.is_verified else 'No'}")
             
-            print("\n🎯 You can now:")
-            print("1. Login to the admin panel with these credentials")
-            print("2. View issues specific to your department")
-            print("3. Resolve reports with coordinate verification")
-        else:
-            print("❌ Failed to create admin user!")
+            mobile_number = input("Enter mobile number (optional): ").strip() or None
+            
+            # Create admin user
+            print(f"\n🚀 Creating admin user for department: {department_name}")
+            admin_user = create_admin_user(
+                db, email, password, full_name, department_name, mobile_number, departments=depts
+            )
+            
+            if admin_user:
+                print("✅ Admin user created successfully!")
+                print(f"   ID: {admin_user.id}")
+                print(f"   Email: {admin_user.email}")
+                print(f"   Name: {admin_user.full_name}")
+                print(f"   Department: {admin_user.department_name}")
+                print(f"   Admin ID: {admin_user.admin_id}")
+                print(f"   Role: {admin_user.role}")
+                print(f"   Status: {'Active' if admin_user.is_active else 'Inactive'}")
+                print(f"   Verified: {'Yes' if admin_user.is_verified else 'No'}")
+                
+                print("\n🎯 You can now:")
+                print("1. Login to the admin panel with these credentials")
+                print("2. View issues specific to your department")
+                print("3. Resolve reports with coordinate verification")
+            else:
+                print("❌ Failed to create admin user!")
             
     except Exception as e:
         print(f"❌ Error: {e}")
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     main()
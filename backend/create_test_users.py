@@ -4,13 +4,10 @@ Script to create test users for CrowdCare system
 """
 
 import sqlite3
-import hashlib
 import uuid
 from datetime import datetime
 
-def hash_password(password: str) -> str:
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+from password_hash import hash_password
 
 def create_test_users():
     """Create test citizen and admin users"""
@@ -3,93 +3,101 @@
 Script to create test users for CrowdCare system using bcrypt (matching auth service)
 """
 
-import sqlite3
 import bcrypt
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def hash_password_bcrypt(password: str) -> str:
+from id_utils import new_uuid_strings
+from sqlite_conn import tuned_conn
+
+# Test-only cost factor: 2^4 key-schedule rounds instead of the default 2^12.
+# bcrypt.checkpw reads the cost from the hash, so the auth service still verifies these.
+SEED_BCRYPT_ROUNDS = 4
+
+def hash_password_bcrypt(password: str, rounds: int = SEED_BCRYPT_ROUNDS) -> str:
     """Hash password using bcrypt (matching auth service)"""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
+def hash_passwords_bcrypt(passwords: list, rounds: int = SEED_BCRYPT_ROUNDS) -> list:
+    """Hash a batch of passwords in parallel (bcrypt releases the GIL while hashing)"""
+    with ThreadPoolExecutor() as pool:
+        return list(pool.map(lambda password: hash_password_bcrypt(password, rounds), passwords))
+
 def create_test_users():
     """Create test citizen and admin users with bcrypt hashing"""
     
-    # Connect to database
-    conn = sqlite3.connect('crowdcare.db')
-    cursor = conn.cursor()
-    
     try:
-        # Test citizen user
-        citizen_id = str(uuid.uuid4())
-        citizen_password_hash = hash_password_bcrypt("testpassword123")
+        # Hash every seed password in one batch before touching the database
+        citizen_password_hash, admin_password_hash = hash_passwords_bcrypt(
+            ["testpassword123", "adminpassword123"]
+        )
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO users (
-                id, email, password_hash, full_name, mobile_number, role, 
-                is_active, is_verified, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            citizen_id,
-            "test@example.com",
-            citizen_password_hash,
-            "Test Citizen",
-            "1234567890",
-            "citizen",
-            True,
-            True,
-            datetime.utcnow().isoformat(),
-            datetime.utcnow().isoformat()
-        ))
+        # All row ids from one entropy draw
+        citizen_id, admin_id = new_uuid_strings(2)
+        now = datetime.utcnow().isoformat()
+        
+        rows = [
+            # Test citizen user (no admin fields)
+            (
+                citizen_id,
+                "test@example.com",
+                citizen_password_hash,
+                "Test Citizen",
+                "1234567890",
+                "citizen",
+                None,
+                None,
+                None,
+                True,
+                True,
+                now,
+                now
+            ),
+            # Test admin user
+            (
+                admin_id,
+                "admin@example.com",
+                admin_password_hash,
+                "Test Admin",
+                "0987654321",
+                "admin",
+                "ADMIN001",
+                "Test City",
+                "Public Works",
+                True,
+                True,
+                now,
+                now
+            ),
+        ]
+        
+        # Single transaction, one executemany for all rows
+        with tuned_conn() as conn, conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO users (
+                    id, email, password_hash, full_name, mobile_number, role,
+                    admin_id, municipality_name, department_name,
+                    is_active, is_verified, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
         
         print("✅ Test citizen user created:")
         print(f"   Email: test@example.com")
         print(f"   Password: testpassword123")
         print(f"   ID: {citizen_id}")
         
-        # Test admin user
-        admin_id = str(uuid.uuid4())
-        admin_password_hash = hash_password_bcrypt("adminpassword123")
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO users (
-                id, email, password_hash, full_name, mobile_number, role,
-                admin_id, municipality_name, department_name,
-                is_active, is_verified, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            admin_id,
-            "admin@example.com",
-            admin_password_hash,
-            "Test Admin",
-            "0987654321",
-            "admin",
-            "ADMIN001",
-            "Test City",
-            "Public Works",
-            True,
-            True,
-            datetime.utcnow().isoformat(),
-            datetime.utcnow().isoformat()
-        ))
-        
         print("✅ Test admin user created:")
         print(f"   Email: admin@example.com")
         print(f"   Password: adminpassword123")
         print(f"   ID: {admin_id}")
         
-        # Commit changes
-        conn.commit()
         print("\n🎉 Test users created successfully with bcrypt hashing!")
         
     except Exception as e:
         print(f"❌ Error creating test users: {e}")
-        conn.rollback()
         raise
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     create_test_users()
@@ -1,39 +1,110 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from functools import lru_cache
 from typing import Optional
 import os
 
 # MongoDB connection
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 MONGODB_DB = os.getenv("MONGODB_DB", "crowdcare")
+# Optional wire-protocol compression, e.g. "zstd,zlib" (unset: driver default, none)
+MONGODB_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS")
+_COMPRESSION_OPTIONS = {"compressors": MONGODB_COMPRESSORS} if MONGODB_COMPRESSORS else {}
+# Connection pool sizes (pymongo's default maximum is 100)
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_SYNC_MAX_POOL_SIZE = int(os.getenv("MONGODB_SYNC_MAX_POOL_SIZE", "100"))
 
-# Async MongoDB client for FastAPI
-async_client = AsyncIOMotorClient(MONGODB_URI)
-async_db = async_client[MONGODB_DB]
+# Clients are created lazily on first use, so importing this module opens no
+# sockets and a process that only uses the async client never starts the sync pool
 
-# Sync MongoDB client for background tasks
-sync_client = MongoClient(MONGODB_URI)
-sync_db = sync_client[MONGODB_DB]
+@lru_cache(maxsize=1)
+def _async_client() -> AsyncIOMotorClient:
+    """Async MongoDB client for FastAPI"""
+    return AsyncIOMotorClient(
+        MONGODB_URI, maxPoolSize=MONGODB_MAX_POOL_SIZE, **_COMPRESSION_OPTIONS
+    )
+
+@lru_cache(maxsize=1)
+def _sync_client() -> MongoClient:
+    """Sync MongoDB client for background tasks"""
+    return MongoClient(MONGODB_URI, maxPoolSize=MONGODB_SYNC_MAX_POOL_SIZE, **_COMPRESSION_OPTIONS)
+
+def _reset_clients():
+    """Drop inherited clients in a forked worker; each process builds its own pools"""
+    _async_client.cache_clear()
+    _sync_client.cache_clear()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clients)
 
 # Collections
-reports_collection = async_db.reports
-users_collection = async_db.users
-refresh_tokens_collection = async_db.refresh_tokens
-department_categories_collection = async_db.department_categories
-category_department_mappings_collection = async_db.category_department_mappings
-citizen_replies_collection = async_db.citizen_replies
-report_ratings_collection = async_db.report_ratings
-report_deletions_collection = async_db.report_deletions
-report_status_history_collection = async_db.report_status_history
-report_upvotes_collection = async_db.report_upvotes
-report_comments_collection = async_db.report_comments
-admin_verifications_collection = async_db.admin_verifications
-face_verifications_collection = async_db.face_verifications
-
-# Dependency to get database
-async def get_database():
-    return async_db
-
-# Dependency to get sync database
-def get_sync_database():
-    return sync_db
+_COLLECTIONS = {
+    "reports_collection": "reports",
+    "users_collection": "users",
+    "refresh_tokens_collection": "refresh_tokens",
+    "department_categories_collection": "department_categories",
+    "category_department_mappings_collection": "category_department_mappings",
+    "citizen_replies_collection": "citizen_replies",
+    "report_ratings_collection": "report_ratings",
+    "report_deletions_collection": "report_deletions",
+    "report_status_history_collection": "report_status_history",
+    "report_upvotes_collection": "report_upvotes",
+    "report_comments_collection": "report_comments",
+    "admin_verifications_collection": "admin_verifications",
+    "face_verifications_collection": "face_verifications",
+}
+
+def __getattr__(name: str):
+    # Module-level attributes (async_db, sync_db, *_collection) resolve lazily
+    if name == "async_client":
+        return _async_client()
+    if name == "async_db":
+        return _async_client()[MONGODB_DB]
+    if name == "sync_client":
+        return _sync_client()
+    if name == "sync_db":
+        return _sync_client()[MONGODB_DB]
+    if name in _COLLECTIONS:
+        return _async_client()[MONGODB_DB][_COLLECTIONS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Dependency to get database (async, so FastAPI calls it inline rather than in the threadpool).
+# Sync callers (background tasks, scripts) use the module-level `sync_db` directly
+async def get_database() -> AsyncIOMotorDatabase:
+    return _async_client()[MONGODB_DB]
+
+# Index builds fail fast when no Mongo server is reachable instead of the 30 s default
+INDEX_SERVER_SELECTION_TIMEOUT_MS = 5000
+
+async def ensure_indexes():
+    """Create the indexes behind the hot report/community queries (idempotent)"""
+    client = AsyncIOMotorClient(MONGODB_URI, serverSelectionTimeoutMS=INDEX_SERVER_SELECTION_TIMEOUT_MS)
+    try:
+        await _create_indexes(client[MONGODB_DB])
+    finally:
+        client.close()
+
+async def _create_indexes(db: AsyncIOMotorDatabase):
+    # Reports: citizen dashboards, category feeds, and the active (not soft-deleted) working set
+    await db.reports.create_index([("reporter_id", ASCENDING), ("status", ASCENDING)])
+    await db.reports.create_index(
+        [("reporter_id", ASCENDING), ("created_at", DESCENDING)],
+        partialFilterExpression={"is_deleted": False},
+    )
+    await db.reports.create_index([("category", ASCENDING), ("created_at", DESCENDING)])
+    await db.reports.create_index(
+        [("status", ASCENDING), ("created_at", DESCENDING)],
+        partialFilterExpression={"is_deleted": False},
+    )
+    
+    # Per-report child collections are always looked up by report_id
+    for name in ("citizen_replies", "report_ratings", "report_comments"):
+        await db[name].create_index([("report_id", ASCENDING), ("created_at", DESCENDING)])
+    await db.report_deletions.create_index("report_id")
+    await db.report_status_history.create_index([("report_id", ASCENDING), ("changed_at", ASCENDING)])
+    await db.report_upvotes.create_index([("report_id", ASCENDING), ("user_id", ASCENDING)], unique=True)
+    
+    # Unique: fails to build while duplicate emails exist, and rejects new duplicates after
+    await db.users.create_index("email", unique=True)
+    # TTL index: Mongo deletes refresh tokens once expires_at has passed (checked about once a minute)
+    await db.refresh_tokens.create_index("expires_at", expireAfterSeconds=0)
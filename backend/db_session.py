@@ -0,0 +1,22 @@
+"""
+Session helper for scripts that run outside a FastAPI request
+"""
+
+from contextlib import contextmanager
+
+from database import get_db
+
+@contextmanager
+def session_scope():
+    """Yield a session from get_db; commit on success, roll back on error, always close"""
+    sessions = get_db()
+    db = next(sessions)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        # Finish the generator so get_db's own cleanup runs now, not at GC time
+        sessions.close()
@@ -10,43 +10,47 @@ import sqlite3
 # Add the backend directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from sqlite_conn import tuned_conn
+
+# Resolution tracking columns the reports table must have, with their SQLite types
+RESOLUTION_COLUMN_TYPES = {
+    'resolved_by': 'TEXT',
+    'resolved_at': 'DATETIME',
+    'resolution_image_url': 'TEXT',
+    'resolution_coordinates': 'TEXT',
+}
+REQUIRED_COLUMNS = frozenset(RESOLUTION_COLUMN_TYPES)
+
 def check_database_schema():
     """Check the current database schema"""
     try:
         # Connect to the database
-        conn = sqlite3.connect('crowdcare.db')
-        cursor = conn.cursor()
-        
-        print("🔍 Checking current database schema...")
-        
-        # Check if reports table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='reports'")
-        if not cursor.fetchone():
-            print("❌ Reports table does not exist!")
-            return False
-        
-        # Check reports table structure
-        cursor.execute("PRAGMA table_info(reports)")
-        columns = cursor.fetchall()
+        with tuned_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            print("🔍 Checking current database schema...")
+            
+            # Check if reports table exists
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='reports'")
+            if not cursor.fetchone():
+                print("❌ Reports table does not exist!")
+                return False
+            
+            # Check reports table structure
+            cursor.execute("PRAGMA table_info(reports)")
+            columns = cursor.fetchall()
         
         print("\n📋 Current reports table columns:")
-        required_columns = [
-            'resolved_by', 'resolved_at', 'resolution_image_url', 'resolution_coordinates'
-        ]
-        
-        existing_columns = [col[1] for col in columns]
+        existing_columns = {col["name"] for col in columns}
         
-        for col in columns:
-            print(f"   • {col[1]} ({col[2]})")
+        print("\n".join(f"   • {col['name']} ({col['type']})" for col in columns))
         
         # Check for missing columns
-        missing_columns = []
-        for col in required_columns:
-            if col not in existing_columns:
-                missing_columns.append(col)
+        missing_columns = REQUIRED_COLUMNS - existing_columns
         
         if missing_columns:
-            print(f"\n❌ Missing columns: {', '.join(missing_columns)}")
+            print(f"\n❌ Missing columns: {', '.join(sorted(missing_columns))}")
             return False
         else:
             print("\n✅ All required columns exist!")
@@ -55,9 +59,6 @@ def check_database_schema():
     except Exception as e:
         print(f"❌ Error checking database: {e}")
         return False
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 def fix_database_schema():
     """Fix the database schema by adding missing columns"""
@@ -65,29 +66,25 @@ def fix_database_schema():
         print("\n🔧 Fixing database schema...")
         
         # Connect to the database
-        conn = sqlite3.connect('crowdcare.db')
-        cursor = conn.cursor()
-        
-        # Add missing columns if they don't exist
-        missing_columns = [
-            ('resolved_by', 'TEXT'),
-            ('resolved_at', 'DATETIME'),
-            ('resolution_image_url', 'TEXT'),
-            ('resolution_coordinates', 'TEXT')
-        ]
-        
-        for col_name, col_type in missing_columns:
-            try:
-                cursor.execute(f"ALTER TABLE reports ADD COLUMN {col_name} {col_type}")
-                print(f"✅ Added column: {col_name}")
-            except sqlite3.OperationalError as e:
-                if "duplicate column name" in str(e):
+        with tuned_conn() as conn:
+            cursor = conn.cursor()
+            
+            # One probe, then DDL only for what is actually missing
+            cursor.execute("PRAGMA table_info(reports)")
+            existing = {row[1] for row in cursor.fetchall()}
+            
+            missing = [col for col in RESOLUTION_COLUMN_TYPES if col not in existing]
+            for col_name in RESOLUTION_COLUMN_TYPES:
+                if col_name in existing:
                     print(f"ℹ️  Column already exists: {col_name}")
-                else:
-                    print(f"⚠️  Error adding column {col_name}: {e}")
+            
+            # All ALTERs in one explicit transaction, committed on leaving the block
+            with conn:
+                conn.execute("BEGIN")
+                for col_name in missing:
+                    cursor.execute(f"ALTER TABLE reports ADD COLUMN {col_name} {RESOLUTION_COLUMN_TYPES[col_name]}")
+                    print(f"✅ Added column: {col_name}")
         
-        # Commit changes
-        conn.commit()
         print("\n✅ Database schema updated!")
         
         return True
@@ -95,9 +92,6 @@ def fix_database_schema():
     except Exception as e:
         print(f"❌ Error fixing database: {e}")
         return False
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 def main():
     """Main function"""
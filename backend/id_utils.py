@@ -0,0 +1,21 @@
+"""
+Identifier helpers for the seeding scripts
+"""
+
+import os
+import uuid
+
+def new_uuid_strings(count: int) -> list:
+    """Generate `count` random (version 4) UUID strings from a single os.urandom draw"""
+    entropy = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=entropy[offset:offset + 16], version=4))
+        for offset in range(0, 16 * count, 16)
+    ]
+
+def new_admin_ids() -> tuple:
+    """Return (user UUID string, 8-char uppercase admin suffix) from one os.urandom draw"""
+    entropy = os.urandom(20)
+    user_id = str(uuid.UUID(bytes=entropy[:16], version=4))
+    admin_suffix = entropy[16:].hex().upper()
+    return user_id, admin_suffix
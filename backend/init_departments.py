@@ -4,57 +4,80 @@ Initialize departments and category mappings for CrowdCare
 Run this script after starting the server to set up the department system
 """
 
-import asyncio
+import hashlib
 import sys
 import os
 
 # Add the backend directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import get_db, engine
+from database import engine
+from db_session import session_scope
 from models import Base, DepartmentCategory, CategoryDepartmentMapping
 from services.department_service import department_service
 
-async def init_departments():
+# Fingerprint of the declared tables and columns; create_all only runs when it changes
+SCHEMA_VERSION = hashlib.sha256(
+    "\n".join(
+        f"{table.name}:{','.join(sorted(column.name for column in table.columns))}"
+        for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name)
+    ).encode()
+).hexdigest()
+
+def ensure_schema() -> bool:
+    """Create tables unless the stored schema version already matches; returns True if create_all ran"""
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE IF NOT EXISTS schema_meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.exec_driver_sql(
+            "SELECT value FROM schema_meta WHERE key = 'schema_version'"
+        ).fetchone()
+        if row and row[0] == SCHEMA_VERSION:
+            return False
+        
+        Base.metadata.create_all(bind=conn)
+        conn.exec_driver_sql(
+            "INSERT OR REPLACE INTO schema_meta (key, value) VALUES ('schema_version', ?)",
+            (SCHEMA_VERSION,)
+        )
+        return True
+
+def init_departments():
     """Initialize departments and category mappings"""
     try:
         print("🚀 Initializing CrowdCare Department System...")
         
-        # Create database tables
-        Base.metadata.create_all(bind=engine)
-        print("✅ Database tables created")
+        # Create database tables (skipped when the schema version is current)
+        if ensure_schema():
+            print("✅ Database tables created")
+        else:
+            print("✅ Database schema up to date")
         
         # Get database session
-        db = next(get_db())
-        
-        # Initialize departments
-        success = await department_service.initialize_departments(db)
-        
-        if success:
-            print("✅ Departments and category mappings initialized successfully!")
-            
-            # Display what was created
-            print("\n📋 Created Departments:")
-            depts = db.query(DepartmentCategory).all()
-            for dept in depts:
-                print(f"  • {dept.name}: {dept.description}")
-            
-            print("\n🔗 Category-Department Mappings:")
-            mappings = db.query(CategoryDepartmentMapping).all()
-            for mapping in mappings:
-                print(f"  • {mapping.category} → {mapping.department_name}")
+        with session_scope() as db:
+            # Initialize departments
+            success = department_service.initialize_departments_sync(db)
             
-            print(f"\n🎉 Total: {len(depts)} departments, {len(mappings)} mappings")
-            
-        else:
-            print("❌ Failed to initialize departments")
-            return False
+            if success:
+                print("✅ Departments and category mappings initialized successfully!")
+                
+                # Display what was created
+                print("\n📋 Created Departments:")
+                depts = db.query(DepartmentCategory).all()
+                print("\n".join(f"  • {dept.name}: {dept.description}" for dept in depts))
+                
+                print("\n🔗 Category-Department Mappings:")
+                mappings = db.query(CategoryDepartmentMapping).all()
+                print("\n".join(f"  • {mapping.category} → {mapping.department_name}" for mapping in mappings))
+                
+                print(f"\n🎉 Total: {len(depts)} departments, {len(mappings)} mappings")
+                
+            else:
+                print("❌ Failed to initialize departments")
+                return False
             
     except Exception as e:
         print(f"❌ Error initializing departments: {e}")
         return False
-    finally:
-        db.close()
     
     return True
 
@@ -62,7 +85,7 @@ if __name__ == "__main__":
     print("CrowdCare Department Initialization Script")
     print("=" * 50)
     
-    success = asyncio.run(init_departments())
+    success = init_departments()
     
     if success:
         print("\n🎯 Next Steps:")
@@ -1,37 +1,53 @@
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, WebSocket, WebSocketDisconnect, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
+import asyncio
 import os
-import json
+import orjson
 from typing import Optional, List
-from sqlalchemy import func
+from contextlib import asynccontextmanager
+from sqlalchemy import bindparam, case, delete, desc, exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 import logging
 from datetime import datetime, timezone
 
-from database import get_db, engine
+from database import get_db, engine, ensure_indexes
+from db_session import session_scope
 from models import Base
 from services.exif_service import extract_gps_from_image
 from services.storage_service import upload_image_to_storage
-from services.report_service import create_report
+from services.report_service import create_report, get_report_by_id
+# Aliased: the GET /reports handler below is itself named get_reports
+from services.report_service import get_reports as list_reports
 from services.ai_service import ai_service
 from services.department_service import department_service
 from services.resolution_service import resolution_service
 from services.status_service import status_service
 from websocket_manager import websocket_manager
 from services.gamification_service import get_gamification_profile, maybe_emit_badge_unlocks
+from services.gamification_cache import get_cached_points, add_points, invalidate_points
+from services.review_cache import (
+    get_cached_citizen_reviews,
+    get_cached_review_stats,
+    invalidate_citizen_reviews,
+    invalidate_review_stats,
+)
 from schemas import (
     ReportCreate, ReportResponse, ErrorResponse, AISummaryRequest, AIClassificationRequest,
     CitizenReplyCreate, CitizenReplyResponse, ReportRatingCreate, ReportRatingResponse,
     ReportDeletionRequest, StatusUpdateRequest, StatusHistoryResponse, 
     ReportResolutionRequest, ReportResolutionResponse,
-    CommunityReport, UpvoteResponse, CommentCreate, CommentResponse,
+    CommunityReport, UpvoteResponse, CommentCreate, CommentResponse, DepartmentIssueResponse,
     ReportCreateAPIResponse, ExistingReportSummary,
     FaceVerifyRequest, FaceVerifyResponse, InstantFaceVerifyRequest
 )
 from routes.auth import router as auth_router
 from routes.auth import get_current_user, get_current_admin
+from services.auth_service import auth_service
 from models import User, CitizenReply, ReportRating, ReportDeletion, Report, ReportUpvote, ReportComment
 from services.face_verification_service import face_verification_service
 from services.storage_service import storage_service
@@ -41,22 +57,73 @@ from models import FaceVerification
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Duplicate detection: same-category active reports within this radius count as duplicates
+DUPLICATE_RADIUS_METERS = 30.0
+MAX_IMAGE_BYTES = 10 * 1024 * 1024  # 10MB
+
+# Per-report counts: built once at import, report id bound per execution
+COUNT_UPVOTES_STMT = select(func.count(ReportUpvote.id)).where(ReportUpvote.report_id == bindparam("report_id"))
+COUNT_COMMENTS_STMT = select(func.count(ReportComment.id)).where(ReportComment.report_id == bindparam("report_id"))
+
+# create_all is a development convenience; deployments that manage the schema
+# with Alembic run with INIT_DB=0 (the default outside ENVIRONMENT=development)
+INIT_DB = os.getenv(
+    "INIT_DB", "1" if os.getenv("ENVIRONMENT", "development") == "development" else "0"
+) == "1"
+# The API's data lives in SQLAlchemy, so building the Mongo indexes is opt-in
+ENSURE_MONGO_INDEXES = os.getenv("ENSURE_MONGO_INDEXES", "0") == "1"
+
+async def ensure_mongo_indexes():
+    """Background startup task: build the Mongo indexes, logging (not raising) failures"""
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logger.error(f"Error creating database indexes: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown: schema, indexes and the WebSocket sweeper"""
+    # Create database tables (off the event loop)
+    if INIT_DB:
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+    
+    # Build Mongo indexes in the background so startup never waits on Mongo
+    mongo_indexes = asyncio.create_task(ensure_mongo_indexes()) if ENSURE_MONGO_INDEXES else None
+    
+    # Periodically drop report subscription buckets left empty by collected sockets
+    websocket_sweeper = asyncio.create_task(websocket_manager.run_sweeper())
+    yield
+    websocket_sweeper.cancel()
+    if mongo_indexes:
+        mongo_indexes.cancel()
+    # Close pooled outbound HTTP clients
+    await ai_service.aclose()
+    await face_verification_service.aclose()
+
 # Create FastAPI app
 app = FastAPI(
     title="CrowdCare API",
     description="Backend API for CrowdCare issue reporting system with AI assistance",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Add CORS middleware
+# Add CORS middleware. CORS_ORIGINS is a comma-separated list of frontend origins;
+# when unset, any localhost / 127.0.0.1 port is allowed for development
+CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "").split(",") if origin.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure this properly for production
+    allow_origins=CORS_ORIGINS,
+    allow_origin_regex=None if CORS_ORIGINS else r"https?://(localhost|127\.0\.0\.1)(:\d+)?",
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
 )
 
+# Compress larger JSON responses; level 1 gets most of the size win for little CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
 # Include authentication routes
 app.include_router(auth_router)
 
@@ -64,9 +131,6 @@ app.include_router(auth_router)
 if os.path.exists("uploads"):
     app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 @app.get("/")
 async def root():
     return {"message": "CrowdCare API v2.0 is running"}
@@ -77,7 +141,7 @@ async def health_check():
 
 # Gamification profile
 @app.get("/gamification/profile")
-async def gamification_profile(
+def gamification_profile(
     db = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -92,28 +156,47 @@ async def gamification_profile(
         logger.error(f"Error building gamification profile: {e}")
         raise HTTPException(status_code=500, detail="Internal server error while building gamification profile")
 
+# Browsers cannot set an Authorization header on WebSockets, so clients offer the
+# subprotocols ["bearer", <access token>]; the server selects "bearer". Unlike a
+# query string, the header does not end up in access or proxy logs
+WS_AUTH_SUBPROTOCOL = "bearer"
+
+def websocket_user_id(websocket: WebSocket) -> Optional[str]:
+    """User id from the access token in Sec-WebSocket-Protocol, or None if it is missing or invalid"""
+    offered = [p.strip() for p in websocket.headers.get("sec-websocket-protocol", "").split(",")]
+    if len(offered) != 2 or offered[0] != WS_AUTH_SUBPROTOCOL:
+        return None
+    payload = auth_service.verify_token(offered[1], "access")
+    return payload.get("sub") if payload else None
+
 # WebSocket endpoint for real-time updates
 @app.websocket("/ws/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
     """WebSocket endpoint for real-time status updates"""
-    await websocket_manager.connect(websocket, user_id)
+    # Connections (and the per-user limit) belong to the token's user, not the path
+    if websocket_user_id(websocket) != user_id:
+        await websocket.close(code=1008)
+        return
+    if not await websocket_manager.connect(
+        websocket, user_id, channel="updates", subprotocol=WS_AUTH_SUBPROTOCOL
+    ):
+        return
     try:
         while True:
-            # Keep connection alive and handle incoming messages
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            # Keep connection alive (pinged when idle) and handle incoming messages
+            data = await websocket_manager.receive_text(websocket)
+            if data is None:
+                continue
+            message = orjson.loads(data)
             
             # Handle different message types
             if message.get("type") == "subscribe_reports":
                 # Subscribe to specific report updates
                 report_ids = message.get("report_ids", [])
-                for report_id in report_ids:
-                    if report_id not in websocket_manager.report_connections:
-                        websocket_manager.report_connections[report_id] = set()
-                    websocket_manager.report_connections[report_id].add(websocket)
+                websocket_manager.subscribe(websocket, report_ids)
                 
                 await websocket_manager.send_personal_message(
-                    json.dumps({"type": "subscribed", "report_ids": report_ids}),
+                    orjson.dumps({"type": "subscribed", "report_ids": report_ids}).decode(),
                     websocket
                 )
             
@@ -127,20 +210,23 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
 @app.websocket("/gamification/stream")
 async def gamification_stream(websocket: WebSocket):
     """WebSocket stream for gamification events (points, badges, streaks)."""
-    await websocket.accept()
-    # user_id via query string
-    user_id = websocket.query_params.get("user_id")
-    if not user_id:
-        await websocket.close()
+    # user_id comes from the access token; a user_id query param must match it
+    user_id = websocket_user_id(websocket)
+    if not user_id or websocket.query_params.get("user_id", user_id) != user_id:
+        await websocket.close(code=1008)
+        return
+    # connect() accepts the socket (it used to be accepted twice here)
+    if not await websocket_manager.connect(
+        websocket, user_id, channel="gamification", subprotocol=WS_AUTH_SUBPROTOCOL
+    ):
         return
     try:
-        await websocket_manager.connect(websocket, user_id)
         await websocket_manager.send_personal_message(
-            json.dumps({"type": "hello", "channel": "gamification", "connected": True}),
+            orjson.dumps({"type": "hello", "channel": "gamification", "connected": True}).decode(),
             websocket,
         )
         while True:
-            _ = await websocket.receive_text()
+            await websocket_manager.receive_text(websocket)
     except WebSocketDisconnect:
         websocket_manager.disconnect(websocket, user_id)
     except Exception as e:
@@ -166,8 +252,159 @@ def to_iso_utc(dt: Optional[datetime]) -> Optional[str]:
         except Exception:
             return None
 
+def department_issue_rows(db, reports) -> List[DepartmentIssueResponse]:
+    """Department issue list rows, with reporter names fetched in one query"""
+    reporter_names = get_user_names(db, {report.reporter_id for report in reports})
+    rows = []
+    for report in reports:
+        row = DepartmentIssueResponse.model_validate(report)
+        row.reporter_name = reporter_names.get(report.reporter_id, "Unknown")
+        rows.append(row)
+    return rows
+
+def upload_size(upload: UploadFile) -> int:
+    """Size of a spooled upload, measured by seeking rather than reading it into memory"""
+    upload_file = upload.file
+    upload_file.seek(0, os.SEEK_END)
+    size = upload_file.tell()
+    upload_file.seek(0)
+    return size
+
+# Helper: resolve display names for a set of user ids in one IN query
+def get_user_names(db, user_ids) -> dict:
+    if not user_ids:
+        return {}
+    return dict(db.query(User.id, User.full_name).filter(User.id.in_(user_ids)).all())
+
+# Dependency: a report the current user may view (its reporter or any admin).
+# FastAPI resolves it once per request, so every consumer shares one lookup
+def get_accessible_report(
+    report_id: int,
+    db = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Report:
+    report = db.query(Report).filter(Report.id == report_id).first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if report.reporter_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Access denied")
+    return report
+
+def save_report_enrichment(
+    report_id: int,
+    ai_title: str,
+    ai_description: Optional[str],
+    ai_tags: Optional[str],
+    urgency_score: float,
+    urgency_label: str
+) -> bool:
+    """Write AI results to a report; returns False if the report no longer exists"""
+    # The request's session is gone by now, so write through a fresh one
+    with session_scope() as db:
+        report = db.query(Report).filter(Report.id == report_id).first()
+        if not report:
+            return False
+        report.title = ai_title
+        report.description = ai_description
+        report.ai_generated_title = ai_title
+        report.ai_generated_description = ai_description
+        report.ai_tags = ai_tags
+        report.urgency_score = urgency_score
+        report.urgency_label = urgency_label
+    return True
+
+async def enrich_report_with_ai(
+    report_id: int,
+    category: str,
+    title: str,
+    description: Optional[str],
+    mcq_data: dict,
+    latitude: float,
+    longitude: float,
+    reporter_id: str,
+    reporter_name: Optional[str],
+    reporter_email: Optional[str]
+):
+    """Background task: generate the AI summary and urgency for a new report, then notify listeners"""
+    # One timestamp for both AI requests. Local wall-clock time (the AI service weighs
+    # rush hours by .hour) but with an explicit UTC offset so it is unambiguous
+    reporting_time = datetime.now().astimezone().isoformat()
+    
+    ai_title = title
+    ai_description = description
+    ai_tags = None
+    
+    # Generate AI summary (basic defaults when no MCQs were provided)
+    try:
+        ai_request = AISummaryRequest(
+            category=category,
+            reporting_time=reporting_time,
+            latitude=latitude,
+            longitude=longitude,
+            mcq_responses=mcq_data or {"duration": "Unknown", "severity": "Medium", "affectedArea": "Local area"},
+            reporter_name=reporter_name,
+            reporter_email=reporter_email
+        )
+        
+        ai_summary = await ai_service.generate_summary(ai_request)
+        ai_title = ai_summary.title
+        ai_description = ai_summary.description
+        ai_tags = orjson.dumps(ai_summary.tags).decode() if ai_summary.tags else None
+        
+        logger.info(f"AI summary generated: {ai_title}")
+        
+    except Exception as e:
+        logger.warning(f"AI summary generation failed: {str(e)}")
+    
+    # Classify urgency using AI
+    urgency_score = 50
+    urgency_label = "Medium"
+    
+    try:
+        classification_request = AIClassificationRequest(
+            title=ai_title,
+            description=ai_description or "",
+            category=category,
+            mcq_responses=mcq_data,
+            latitude=latitude,
+            longitude=longitude,
+            reporter_name=reporter_name,
+            reporter_email=reporter_email,
+            reporting_time=reporting_time,
+            image_description=ai_title  # Use AI-generated title as image description
+        )
+        
+        classification = await ai_service.classify_urgency(classification_request)
+        urgency_score = classification.urgency_score
+        urgency_label = classification.urgency_label
+        
+        logger.info(f"AI urgency classification: {urgency_label} ({urgency_score})")
+        
+    except Exception as e:
+        logger.warning(f"AI urgency classification failed: {str(e)}")
+    
+    # The sync ORM write runs in the threadpool, off the event loop
+    try:
+        saved = await asyncio.to_thread(
+            save_report_enrichment,
+            report_id, ai_title, ai_description, ai_tags, urgency_score, urgency_label
+        )
+    except Exception as e:
+        logger.error(f"Error saving AI enrichment for report {report_id}: {e}")
+        return
+    if not saved:
+        return
+    
+    try:
+        await websocket_manager.broadcast_report_enriched(
+            report_id, reporter_id, ai_title, ai_description, urgency_score, urgency_label
+        )
+    except Exception:
+        pass
+
 @app.post("/reports/create", response_model=ReportCreateAPIResponse)
 async def create_issue_report(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     description: Optional[str] = Form(None),
     category: str = Form(...),
@@ -181,6 +418,9 @@ async def create_issue_report(
     """
     Create a new issue report with image upload, GPS extraction, and AI assistance.
     
+    The report is stored and returned right away; the AI summary and urgency
+    classification run in the background and are pushed over the WebSocket.
+    
     - **title**: Short title of the issue
     - **description**: Optional description of the issue
     - **category**: Issue category (pothole, garbage, etc.)
@@ -197,25 +437,22 @@ async def create_issue_report(
                 detail="File must be an image (JPEG/PNG)"
             )
         
-        # Validate file size (10MB limit)
-        file_size = 0
-        content = await image.read()
-        file_size = len(content)
+        # Validate file size (10MB limit). The upload is already spooled to a temp
+        # file, so measure it there rather than reading it into memory
+        image_file = image.file
+        file_size = upload_size(image)
         
-        if file_size > 10 * 1024 * 1024:  # 10MB
+        if file_size > MAX_IMAGE_BYTES:
             raise HTTPException(
                 status_code=400,
                 detail="File size must be less than 10MB"
             )
         
-        # Reset file pointer
-        await image.seek(0)
-        
         # Extract GPS data from EXIF
         gps_data = None
         try:
-            logger.info(f"Attempting to extract GPS from image, content size: {len(content)} bytes")
-            gps_data = await extract_gps_from_image(content)
+            logger.info(f"Attempting to extract GPS from image, content size: {file_size} bytes")
+            gps_data = await extract_gps_from_image(image_file)
             logger.info(f"EXIF GPS data extracted: {gps_data}")
         except Exception as e:
             logger.warning(f"Failed to extract EXIF GPS data: {e}")
@@ -237,27 +474,39 @@ async def create_issue_report(
         try:
             # Only consider active (non-deleted and not resolved) reports for duplication
             active_statuses = ["reported", "acknowledged", "in_progress"]
+            normalized_new_cat = (category or "").strip().lower()
+            
+            # Let the database cut candidates down to the same category inside a
+            # ~30 m bounding box, so only a handful of rows reach the Haversine check
+            dlat, dlon = resolution_service.bounding_box(
+                final_latitude, final_longitude, DUPLICATE_RADIUS_METERS
+            )
             candidates = db.query(Report).filter(
                 Report.is_deleted == False,
-                Report.status.in_(active_statuses)
+                Report.status.in_(active_statuses),
+                func.lower(func.trim(Report.category)) == normalized_new_cat,
+                Report.latitude.between(final_latitude - dlat, final_latitude + dlat),
+                Report.longitude.between(final_longitude - dlon, final_longitude + dlon)
             ).all()
 
             nearest = None
             nearest_distance = float('inf')
 
-            # Use existing Haversine logic from resolution service
-            normalized_new_cat = (category or "").strip().lower()
+            # Use existing Haversine logic from resolution service; the target point is
+            # fixed for this request, so reports sharing coordinates reuse one result
+            distances = {}
             for r in candidates:
                 try:
-                    # Categories must match (case-insensitive) to treat as duplicate
-                    normalized_existing_cat = (r.category or "").strip().lower()
-                    if normalized_existing_cat != normalized_new_cat:
+                    # Cheap comparisons first; Haversine only for points inside the box
+                    if abs(r.latitude - final_latitude) > dlat or abs(r.longitude - final_longitude) > dlon:
                         continue
-
-                    d = resolution_service.calculate_distance(
-                        r.latitude, r.longitude, final_latitude, final_longitude
-                    )
-                    if d <= 30.0 and d < nearest_distance:
+                    point = (r.latitude, r.longitude)
+                    d = distances.get(point)
+                    if d is None:
+                        d = distances[point] = resolution_service.calculate_distance(
+                            r.latitude, r.longitude, final_latitude, final_longitude
+                        )
+                    if d <= DUPLICATE_RADIUS_METERS and d < nearest_distance:
                         nearest = r
                         nearest_distance = d
                 except Exception:
@@ -265,8 +514,8 @@ async def create_issue_report(
 
             if nearest is not None:
                 # Build counts
-                upvotes_count = db.query(func.count(ReportUpvote.id)).filter(ReportUpvote.report_id == nearest.id).scalar() or 0
-                comments_count = db.query(func.count(ReportComment.id)).filter(ReportComment.report_id == nearest.id).scalar() or 0
+                upvotes_count = db.execute(COUNT_UPVOTES_STMT, {"report_id": nearest.id}).scalar_one()
+                comments_count = db.execute(COUNT_COMMENTS_STMT, {"report_id": nearest.id}).scalar_one()
 
                 return {
                     "duplicate": True,
@@ -286,70 +535,23 @@ async def create_issue_report(
             logger.warning(f"Duplicate detection failed, proceeding with creation: {e}")
 
         # Upload image to storage
-        image_url = await upload_image_to_storage(image, content)
+        image_file.seek(0)
+        image_url = await upload_image_to_storage(image, image_file)
         
         # Parse MCQ responses
         mcq_data = {}
         if mcq_responses:
             try:
-                mcq_data = json.loads(mcq_responses)
-            except json.JSONDecodeError:
+                mcq_data = orjson.loads(mcq_responses)
+            except orjson.JSONDecodeError:
                 logger.warning("Invalid MCQ responses JSON format")
                 mcq_data = {}
         
-        # Generate AI summary if MCQs are provided
-        ai_title = title
-        ai_description = description
-        ai_tags = None
-        
-        if mcq_data:
-            try:
-                ai_request = AISummaryRequest(
-                    category=category,
-                    reporting_time=datetime.now().isoformat(),
-                    latitude=final_latitude,
-                    longitude=final_longitude,
-                    mcq_responses=mcq_data,
-                    reporter_name=current_user.full_name,
-                    reporter_email=current_user.email
-                )
-                
-                ai_summary = await ai_service.generate_summary(ai_request)
-                ai_title = ai_summary.title
-                ai_description = ai_summary.description
-                ai_tags = json.dumps(ai_summary.tags) if ai_summary.tags else None
-                
-                logger.info(f"AI summary generated: {ai_title}")
-                
-            except Exception as e:
-                logger.warning(f"AI summary generation failed: {str(e)}")
-        else:
-            # Generate basic report even without MCQs
-            try:
-                ai_request = AISummaryRequest(
-                    category=category,
-                    reporting_time=datetime.now().isoformat(),
-                    latitude=final_latitude,
-                    longitude=final_longitude,
-                    mcq_responses={"duration": "Unknown", "severity": "Medium", "affectedArea": "Local area"},
-                    reporter_name=current_user.full_name,
-                    reporter_email=current_user.email
-                )
-                
-                ai_summary = await ai_service.generate_summary(ai_request)
-                ai_title = ai_summary.title
-                ai_description = ai_summary.description
-                ai_tags = json.dumps(ai_summary.tags) if ai_summary.tags else None
-                
-                logger.info(f"Basic AI summary generated: {ai_title}")
-                
-            except Exception as e:
-                logger.warning(f"Basic AI summary generation failed: {str(e)}")
-        
-        # Create report in database
+        # Store the report as submitted; AI title/description/urgency are filled in
+        # by a background task after the response has been sent
         report_data = ReportCreate(
-            title=ai_title,
-            description=ai_description,
+            title=title,
+            description=description,
             category=category,
             image_url=image_url,
             latitude=final_latitude,
@@ -360,61 +562,41 @@ async def create_issue_report(
         report = await create_report(
             db,
             report_data,
-            ai_title,
-            ai_description,
-            ai_tags,
-            mcq_data,
+            mcq_responses=mcq_data,
             reporter_id=current_user.id
         )
-        
-        # Classify urgency using AI
-        urgency_score = 50
-        urgency_label = "Medium"
-        
-        try:
-            # Get current user information for enhanced analysis
-            reporter_name = current_user.full_name if current_user else None
-            reporter_email = current_user.email if current_user else None
-            
-            classification_request = AIClassificationRequest(
-                title=ai_title,
-                description=ai_description or "",
-                category=category,
-                mcq_responses=mcq_data,
-                latitude=final_latitude,
-                longitude=final_longitude,
-                reporter_name=reporter_name,
-                reporter_email=reporter_email,
-                reporting_time=datetime.now().isoformat(),
-                image_description=ai_title  # Use AI-generated title as image description
-            )
-            
-            classification = await ai_service.classify_urgency(classification_request)
-            urgency_score = classification.urgency_score
-            urgency_label = classification.urgency_label
-            
-            # Update report with urgency classification
-            report.urgency_score = urgency_score
-            report.urgency_label = urgency_label
-            db.commit()
-            
-            logger.info(f"AI urgency classification: {urgency_label} ({urgency_score})")
-            
-        except Exception as e:
-            logger.warning(f"AI urgency classification failed: {str(e)}")
+        department_service.invalidate_department_stats()
+        
+        background_tasks.add_task(
+            enrich_report_with_ai,
+            report.id,
+            category,
+            title,
+            description,
+            mcq_data,
+            final_latitude,
+            final_longitude,
+            current_user.id,
+            current_user.full_name,
+            current_user.email
+        )
         
         # Gamification: emit points and badge unlocks after successful creation
         try:
             # snapshot before
             prev = get_gamification_profile(db, current_user)
-            # naive points update (report created)
-            await websocket_manager.broadcast_gamification_event(current_user.id, {"type": "points_update", "delta": 50, "total": prev["user"]["points"] + 50})
+            invalidate_points(current_user.id)
             # recompute and detect badge unlocks
             newly = maybe_emit_badge_unlocks(db, current_user, prev)
-            for n in newly:
-                await websocket_manager.broadcast_gamification_event(current_user.id, {"type": "badge_unlocked", "badge": n["label"], "points_added": 0})
-            # streak update
-            await websocket_manager.broadcast_gamification_event(current_user.id, {"type": "streak_update", "streak_days": prev["user"].get("streak_days", 0) + 1})
+            # naive points update (report created), badge unlocks, streak update
+            events = [{"type": "points_update", "delta": 50, "total": prev["user"]["points"] + 50}]
+            events.extend({"type": "badge_unlocked", "badge": n["label"], "points_added": 0} for n in newly)
+            events.append({"type": "streak_update", "streak_days": prev["user"].get("streak_days", 0) + 1})
+            # Send them concurrently; a dead socket must not fail the create
+            await asyncio.gather(
+                *(websocket_manager.broadcast_gamification_event(current_user.id, event) for event in events),
+                return_exceptions=True
+            )
         except Exception:
             pass
 
@@ -440,7 +622,7 @@ async def create_issue_report(
         )
 
 @app.get("/admin/reports")
-async def get_admin_reports(
+def get_admin_reports(
     urgency_filter: Optional[str] = None,
     status_filter: Optional[str] = None,
     db = Depends(get_db),
@@ -450,44 +632,29 @@ async def get_admin_reports(
     Get all reports for admin dashboard with urgency ranking
     """
     try:
-        from models import Report
-        from sqlalchemy import desc
         
-        query = db.query(Report)
+        # Only the columns the dashboard shows, as plain rows (no ORM identity map)
+        query = select(
+            Report.id, Report.title, Report.category, Report.description,
+            Report.latitude, Report.longitude, Report.urgency_score, Report.urgency_label,
+            Report.status, Report.created_at, Report.image_url,
+            Report.ai_generated_title, Report.ai_generated_description, Report.mcq_responses,
+            Report.is_deleted, Report.deletion_reason, Report.deleted_at, Report.reporter_id
+        )
         
         # Apply filters
         if urgency_filter:
-            query = query.filter(Report.urgency_label == urgency_filter)
+            query = query.where(Report.urgency_label == urgency_filter)
         
         if status_filter:
-            query = query.filter(Report.status == status_filter)
+            query = query.where(Report.status == status_filter)
         
         # Sort by urgency score (highest first)
-        reports = query.order_by(desc(Report.urgency_score)).all()
+        rows = db.execute(query.order_by(desc(Report.urgency_score))).mappings()
         
-        return [
-            {
-                "id": report.id,
-                "title": report.title,
-                "category": report.category,
-                "description": report.description,
-                "latitude": report.latitude,
-                "longitude": report.longitude,
-                "urgency_score": report.urgency_score,
-                "urgency_label": report.urgency_label,
-                "status": report.status,
-                "created_at": report.created_at.isoformat() if report.created_at else None,
-                "image_url": report.image_url,
-                "ai_generated_title": report.ai_generated_title,
-                "ai_generated_description": report.ai_generated_description,
-                "mcq_responses": report.mcq_responses,
-                "is_deleted": bool(report.is_deleted),
-                "deletion_reason": report.deletion_reason,
-                "deleted_at": report.deleted_at.isoformat() if report.deleted_at else None,
-                "reporter_id": report.reporter_id
-            }
-            for report in reports
-        ]
+        # Returned as a response directly so orjson formats the datetimes in C
+        # (same ISO 8601 output as isoformat()) instead of jsonable_encoder in Python
+        return ORJSONResponse([{**row, "is_deleted": bool(row["is_deleted"])} for row in rows])
         
     except Exception as e:
         logger.error(f"Error fetching admin reports: {e}")
@@ -504,8 +671,7 @@ async def get_reports(
 ):
     """Get all reports with pagination."""
     try:
-        from services.report_service import get_reports
-        reports = await get_reports(db, skip=skip, limit=limit)
+        reports = await list_reports(db, skip=skip, limit=limit)
         return reports
     except Exception as e:
         logger.error(f"Error fetching reports: {e}")
@@ -516,7 +682,7 @@ async def get_reports(
 
 # Community Endpoints (placed before /reports/{report_id} to avoid path conflicts)
 @app.get("/reports/community", response_model=List[CommunityReport])
-async def get_community_reports(
+def get_community_reports(
     skip: int = 0,
     limit: int = 50,
     sort: Optional[str] = "upvotes",
@@ -526,131 +692,139 @@ async def get_community_reports(
     """Fetch reports in user's municipality/local area with upvotes and comments count."""
     try:
         # For now, approximate by municipality_name on reporter user, else return all
-        # Fetch base reports (non-deleted)
-        base_query = db.query(Report).filter(Report.is_deleted == False)
-
-        reports = base_query.all()
-
-        # Preload counts to minimize queries
-        report_ids = [r.id for r in reports]
-        upvote_counts = {rid: 0 for rid in report_ids}
-        comment_counts = {rid: 0 for rid in report_ids}
-
-        if report_ids:
-            from sqlalchemy import func
-            upvote_rows = db.query(ReportUpvote.report_id, func.count(ReportUpvote.id)).filter(ReportUpvote.report_id.in_(report_ids)).group_by(ReportUpvote.report_id).all()
-            for rid, cnt in upvote_rows:
-                upvote_counts[rid] = cnt
-
-            comment_rows = db.query(ReportComment.report_id, func.count(ReportComment.id)).filter(ReportComment.report_id.in_(report_ids)).group_by(ReportComment.report_id).all()
-            for rid, cnt in comment_rows:
-                comment_counts[rid] = cnt
-
-        # Sort
-        def sort_key(r: Report):
-            if sort == "latest":
-                return (r.created_at or datetime.min, upvote_counts.get(r.id, 0))
-            elif sort == "urgency":
-                return (r.urgency_score or 0, upvote_counts.get(r.id, 0))
-            else:  # upvotes default
-                return (upvote_counts.get(r.id, 0), r.created_at or datetime.min)
-
-        reports_sorted = sorted(reports, key=sort_key, reverse=True)
-        reports_paginated = reports_sorted[skip: skip + limit]
-
-        # Build response with reporter names and whether current user has upvoted
-        user_upvoted = set()
-        if report_ids:
-            rows = db.query(ReportUpvote.report_id).filter(
-                ReportUpvote.report_id.in_(report_ids),
-                ReportUpvote.user_id == current_user.id
-            ).all()
-            user_upvoted = {r[0] for r in rows}
-
-        user_map = {}
-        result: List[CommunityReport] = []
-        for r in reports_paginated:
-            reporter_name = None
-            if r.reporter_id:
-                if r.reporter_id not in user_map:
-                    user_obj = db.query(User).filter(User.id == r.reporter_id).first()
-                    user_map[r.reporter_id] = user_obj.full_name if user_obj else None
-                reporter_name = user_map.get(r.reporter_id)
-            result.append(CommunityReport(
-                id=r.id,
-                title=r.title,
-                category=r.category,
-                reporter_name=reporter_name,
-                status=r.status,
-                upvotes=upvote_counts.get(r.id, 0),
-                comments_count=comment_counts.get(r.id, 0),
-                urgency_score=r.urgency_score or 0,
-                created_at=r.created_at,
-                ai_generated_title=r.ai_generated_title,
-                ai_generated_description=r.ai_generated_description,
-                image_url=r.image_url,
-                user_has_upvoted=(r.id in user_upvoted)
-            ))
-
-        return result
+        # Counts are correlated subqueries, sorted and paginated in SQL so only one page
+        # is loaded. comments_count is not in any ORDER BY, so it is only evaluated for
+        # the returned page (Postgres defers costly select-list expressions past the
+        # LIMIT) rather than grouping the whole comments table on every request
+        upvotes_col = select(func.count(ReportUpvote.id)).where(
+            ReportUpvote.report_id == Report.id
+        ).correlate(Report).scalar_subquery().label("upvotes")
+        comments_col = select(func.count(ReportComment.id)).where(
+            ReportComment.report_id == Report.id
+        ).correlate(Report).scalar_subquery().label("comments_count")
+        # Whether the current user upvoted, answered by the unique (report_id, user_id) index
+        user_upvoted_col = exists().where(
+            ReportUpvote.report_id == Report.id,
+            ReportUpvote.user_id == current_user.id
+        ).correlate(Report).label("user_has_upvoted")
+
+        urgency_col = func.coalesce(Report.urgency_score, 0).label("urgency_score")
+
+        if sort == "latest":
+            order_by = (Report.created_at.desc().nulls_last(), upvotes_col.desc())
+        elif sort == "urgency":
+            order_by = (urgency_col.desc(), upvotes_col.desc())
+        else:  # upvotes default
+            order_by = (upvotes_col.desc(), Report.created_at.desc().nulls_last())
+
+        # Plain column select (no ORM entities), labelled with the CommunityReport field
+        # names; reporter names come from the same query via an outer join on users
+        stmt = select(
+            Report.id,
+            Report.title,
+            Report.category,
+            User.full_name.label("reporter_name"),
+            Report.status,
+            upvotes_col,
+            comments_col,
+            urgency_col,
+            Report.created_at,
+            Report.ai_generated_title,
+            Report.ai_generated_description,
+            Report.image_url,
+            user_upvoted_col,
+        ).outerjoin(
+            User, User.id == Report.reporter_id
+        ).where(
+            Report.is_deleted == False
+        ).order_by(*order_by, Report.id.desc()).offset(skip).limit(limit)
+
+        # Returned as a response directly: the rows already match CommunityReport, so
+        # skip response_model revalidation and let orjson encode them (response_model
+        # still documents the shape)
+        return ORJSONResponse([
+            {**row, "user_has_upvoted": bool(row["user_has_upvoted"])}
+            for row in db.execute(stmt).mappings()
+        ])
     except Exception as e:
         logger.error(f"Error fetching community reports: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+async def broadcast_upvote_events(
+    report_id: int, total_upvotes: int, user_id: str, action: str, points_event: Optional[dict]
+):
+    """Background task: new upvote count to report subscribers, points update to the voter"""
+    try:
+        await websocket_manager.broadcast_upvote_update(report_id, total_upvotes, user_id, action)
+    except Exception:
+        pass
+    if points_event:
+        try:
+            await websocket_manager.broadcast_gamification_event(user_id, points_event)
+        except Exception:
+            pass
+
 @app.post("/reports/{report_id}/upvote", response_model=UpvoteResponse)
-async def toggle_upvote(
+def toggle_upvote(
     report_id: int,
+    background_tasks: BackgroundTasks,
     db = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Toggle upvote for a report by the current user."""
     try:
-        report = db.query(Report).filter(Report.id == report_id, Report.is_deleted == False).first()
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-
-        existing = db.query(ReportUpvote).filter(
-            ReportUpvote.report_id == report_id,
-            ReportUpvote.user_id == current_user.id
+        # Toggle off if an upvote exists: DELETE ... RETURNING tells us in one statement
+        removed = db.execute(
+            delete(ReportUpvote)
+            .where(ReportUpvote.report_id == report_id, ReportUpvote.user_id == current_user.id)
+            .returning(ReportUpvote.id)
         ).first()
+        action = "removed" if removed else "added"
+
+        # Adjust urgency by +/- 0.5 per toggle (floored at 0) in the same transaction,
+        # as one atomic UPDATE so concurrent toggles can't overwrite each other. Its
+        # RETURNING doubles as the existence check for an active report
+        adjusted_score = func.coalesce(Report.urgency_score, 0) + (0.5 if action == "added" else -0.5)
+        updated = db.execute(
+            update(Report)
+            .where(Report.id == report_id, Report.is_deleted == False)
+            .values(urgency_score=case((adjusted_score < 0, 0.0), else_=adjusted_score))
+            .returning(Report.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if not updated:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Report not found")
 
-        action = "added"
-        if existing:
-            db.delete(existing)
-            action = "removed"
-        else:
-            db.add(ReportUpvote(report_id=report_id, user_id=current_user.id))
-
-        db.commit()
-
-        from sqlalchemy import func
-        total_upvotes = db.query(func.count(ReportUpvote.id)).filter(ReportUpvote.report_id == report_id).scalar() or 0
-
-        # Adjust urgency by +/- 0.5 per toggle
+        changed = True
         try:
-            report.urgency_score = float(report.urgency_score or 0)
             if action == "added":
-                report.urgency_score = report.urgency_score + 0.5
-            else:
-                report.urgency_score = max(0.0, report.urgency_score - 0.5)
+                db.execute(insert(ReportUpvote).values(report_id=report_id, user_id=current_user.id))
             db.commit()
-        except Exception:
+        except IntegrityError:
+            # A concurrent request inserted this upvote first (uq_report_upvote): roll back
+            # our urgency bump and report the upvote as already present
             db.rollback()
+            changed = False
 
-        # Broadcast via websocket
-        try:
-            await websocket_manager.broadcast_upvote_update(report_id, total_upvotes, current_user.id, action)
-        except Exception:
-            pass
+        total_upvotes = db.execute(COUNT_UPVOTES_STMT, {"report_id": report_id}).scalar_one()
 
-        # Gamification: upvote given adds small points
-        try:
-            prev = get_gamification_profile(db, current_user)
-            delta = 2 if action == "added" else -2
-            await websocket_manager.broadcast_gamification_event(current_user.id, {"type": "points_update", "delta": delta, "total": prev["user"]["points"] + max(0, delta)})
-        except Exception:
-            pass
+        if changed:
+            # Gamification: upvote given adds small points
+            points_event = None
+            try:
+                delta = 2 if action == "added" else -2
+                add_points(current_user.id, delta)
+                total = get_cached_points(db, current_user.id)
+                points_event = {"type": "points_update", "delta": delta, "total": total}
+            except Exception:
+                pass
+
+            # Broadcast via websocket once the response is sent
+            background_tasks.add_task(
+                broadcast_upvote_events, report_id, total_upvotes, current_user.id, action, points_event
+            )
 
         return UpvoteResponse(
             message="Upvote removed successfully" if action == "removed" else "Upvote added successfully",
@@ -665,7 +839,7 @@ async def toggle_upvote(
 
 
 @app.get("/reports/{report_id}/comments", response_model=List[CommentResponse])
-async def get_report_comments(
+def get_report_comments(
     report_id: int,
     db = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -676,24 +850,22 @@ async def get_report_comments(
         if not report:
             raise HTTPException(status_code=404, detail="Report not found")
 
-        comments = db.query(ReportComment).filter(ReportComment.report_id == report_id).order_by(ReportComment.created_at.desc()).all()
-
-        # Attach user_name
-        user_names = {}
-        responses: List[CommentResponse] = []
-        for c in comments:
-            if c.user_id not in user_names:
-                u = db.query(User).filter(User.id == c.user_id).first()
-                user_names[c.user_id] = u.full_name if u else None
-            responses.append(CommentResponse(
-                id=c.id,
-                report_id=c.report_id,
-                user_id=c.user_id,
-                user_name=user_names.get(c.user_id),
-                comment=c.comment,
-                created_at=c.created_at
-            ))
-        return responses
+        # Commenter names joined into the same query
+        comments = db.query(ReportComment, User.full_name).outerjoin(
+            User, User.id == ReportComment.user_id
+        ).filter(ReportComment.report_id == report_id).order_by(ReportComment.created_at.desc()).all()
+
+        return [
+            {
+                "id": c.id,
+                "report_id": c.report_id,
+                "user_id": c.user_id,
+                "user_name": user_name,
+                "comment": c.comment,
+                "created_at": c.created_at
+            }
+            for c, user_name in comments
+        ]
     except HTTPException:
         raise
     except Exception as e:
@@ -716,17 +888,21 @@ async def add_report_comment(
 
         comment = ReportComment(report_id=report_id, user_id=current_user.id, comment=data.comment)
         db.add(comment)
+        # INSERT ... RETURNING fills id/created_at on flush; build the response before
+        # commit expires the instance, so no refresh SELECT is needed
+        db.flush()
+        response = CommentResponse.model_validate(comment)
+        response.user_name = current_user.full_name
         db.commit()
-        db.refresh(comment)
 
         # Broadcast via websocket
         try:
             await websocket_manager.broadcast_comment_new(
                 report_id=report_id,
-                comment_id=comment.id,
+                comment_id=response.id,
                 user_id=current_user.id,
-                comment=comment.comment,
-                created_at=comment.created_at.isoformat(),
+                comment=response.comment,
+                created_at=response.created_at.isoformat(),
                 user_name=current_user.full_name
             )
         except Exception:
@@ -734,19 +910,13 @@ async def add_report_comment(
 
         # Gamification: comment adds small points
         try:
-            prev = get_gamification_profile(db, current_user)
-            await websocket_manager.broadcast_gamification_event(current_user.id, {"type": "points_update", "delta": 3, "total": prev["user"]["points"] + 3})
+            add_points(current_user.id, 3)
+            total = get_cached_points(db, current_user.id)
+            await websocket_manager.broadcast_gamification_event(current_user.id, {"type": "points_update", "delta": 3, "total": total})
         except Exception:
             pass
 
-        return CommentResponse(
-            id=comment.id,
-            report_id=comment.report_id,
-            user_id=comment.user_id,
-            user_name=current_user.full_name,
-            comment=comment.comment,
-            created_at=comment.created_at
-        )
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -759,31 +929,11 @@ async def get_report(
 ):
     """Get a specific report by ID."""
     try:
-        from services.report_service import get_report_by_id
         report = await get_report_by_id(db, report_id)
         if not report:
             raise HTTPException(status_code=404, detail="Report not found")
         
-        return ReportResponse(
-            id=report.id,
-            title=report.title,
-            description=report.description,
-            category=report.category,
-            image_url=report.image_url,
-            latitude=report.latitude,
-            longitude=report.longitude,
-            ai_generated_title=report.ai_generated_title,
-            ai_generated_description=report.ai_generated_description,
-            ai_tags=report.ai_tags,
-            urgency_score=report.urgency_score,
-            urgency_label=report.urgency_label,
-            mcq_responses=report.mcq_responses,
-            reporter_id=report.reporter_id,
-            status=report.status,
-            admin_notes=report.admin_notes,
-            created_at=report.created_at,
-            updated_at=report.updated_at
-        )
+        return ReportResponse.model_validate(report)
     except HTTPException:
         raise
     except Exception as e:
@@ -811,22 +961,12 @@ async def initialize_departments(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/admin/departments")
-async def get_all_departments(
+def get_all_departments(
     db = Depends(get_db)
 ):
     """Get all available departments"""
     try:
-        from models import DepartmentCategory
-        departments = db.query(DepartmentCategory).filter(DepartmentCategory.is_active == True).all()
-        
-        return [
-            {
-                "id": dept.id,
-                "name": dept.name,
-                "description": dept.description
-            }
-            for dept in departments
-        ]
+        return department_service.get_active_departments(db)
     except Exception as e:
         logger.error(f"Error fetching departments: {e}")
         raise HTTPException(
@@ -834,7 +974,7 @@ async def get_all_departments(
             detail="Internal server error while fetching departments"
         )
 
-@app.get("/admin/departments/my-issues")
+@app.get("/admin/departments/my-issues", response_model=List[DepartmentIssueResponse])
 async def get_my_department_issues(
     urgency_filter: Optional[str] = None,
     status_filter: Optional[str] = None,
@@ -853,32 +993,7 @@ async def get_my_department_issues(
             db, current_admin.department_name, status_filter, urgency_filter
         )
         
-        # Get reporter information for each report
-        result = []
-        for report in reports:
-            # Get reporter info
-            reporter = db.query(User).filter(User.id == report.reporter_id).first()
-            reporter_name = reporter.full_name if reporter else "Unknown"
-            
-            result.append({
-                "id": report.id,
-                "title": report.title,
-                "category": report.category,
-                "description": report.description,
-                "latitude": report.latitude,
-                "longitude": report.longitude,
-                "urgency_score": report.urgency_score,
-                "urgency_label": report.urgency_label,
-                "status": report.status,
-                "created_at": report.created_at.isoformat(),
-                "image_url": report.image_url,
-                "ai_generated_title": report.ai_generated_title,
-                "ai_generated_description": report.ai_generated_description,
-                "mcq_responses": report.mcq_responses,
-                "reporter_name": reporter_name
-            })
-        
-        return result
+        return department_issue_rows(db, reports)
         
     except HTTPException:
         raise
@@ -889,7 +1004,7 @@ async def get_my_department_issues(
             detail="Internal server error while fetching department issues"
         )
 
-@app.get("/admin/departments/other-issues")
+@app.get("/admin/departments/other-issues", response_model=List[DepartmentIssueResponse])
 async def get_other_department_issues(
     urgency_filter: Optional[str] = None,
     status_filter: Optional[str] = None,
@@ -908,32 +1023,7 @@ async def get_other_department_issues(
             db, current_admin.department_name, status_filter, urgency_filter
         )
         
-        # Get reporter information for each report
-        result = []
-        for report in reports:
-            # Get reporter info
-            reporter = db.query(User).filter(User.id == report.reporter_id).first()
-            reporter_name = reporter.full_name if reporter else "Unknown"
-            
-            result.append({
-                "id": report.id,
-                "title": report.title,
-                "category": report.category,
-                "description": report.description,
-                "latitude": report.latitude,
-                "longitude": report.longitude,
-                "urgency_score": report.urgency_score,
-                "urgency_label": report.urgency_label,
-                "status": report.status,
-                "created_at": report.created_at.isoformat(),
-                "image_url": report.image_url,
-                "ai_generated_title": report.ai_generated_title,
-                "ai_generated_description": report.ai_generated_description,
-                "mcq_responses": report.mcq_responses,
-                "reporter_name": reporter_name
-            })
-        
-        return result
+        return department_issue_rows(db, reports)
         
     except HTTPException:
         raise
@@ -988,6 +1078,8 @@ async def update_report_status(
         
         # Broadcast status update via WebSocket
         if result.get("success"):
+            department_service.invalidate_department_stats()
+            invalidate_citizen_reviews()
             await websocket_manager.broadcast_status_update(
                 report_id=report_id,
                 old_status=result.get("old_status", ""),
@@ -1006,23 +1098,23 @@ async def update_report_status(
         )
 
 @app.get("/reports/{report_id}/status-history", response_model=List[StatusHistoryResponse])
-async def get_report_status_history(
+def get_report_status_history(
     report_id: int,
     db = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get status history for a report"""
     try:
-        # Verify user has access to this report
-        report = db.query(Report).filter(Report.id == report_id).first()
-        if not report:
+        # Owner (for the access check) and history come back in one query
+        owner_and_history = status_service.get_status_history_with_owner(db, report_id)
+        if owner_and_history is None:
             raise HTTPException(status_code=404, detail="Report not found")
+        reporter_id, history = owner_and_history
         
         # Check if user is the reporter or an admin
-        if report.reporter_id != current_user.id and current_user.role != "admin":
+        if reporter_id != current_user.id and current_user.role != "admin":
             raise HTTPException(status_code=403, detail="Access denied")
         
-        history = await status_service.get_status_history(db, report_id)
         return [StatusHistoryResponse(**entry) for entry in history]
     except HTTPException:
         raise
@@ -1037,20 +1129,11 @@ async def get_report_status_history(
 async def get_report_status_timeline(
     report_id: int,
     db = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    report: Report = Depends(get_accessible_report)
 ):
     """Get complete status timeline for a report"""
     try:
-        # Verify user has access to this report
-        report = db.query(Report).filter(Report.id == report_id).first()
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-        
-        # Check if user is the reporter or an admin
-        if report.reporter_id != current_user.id and current_user.role != "admin":
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        timeline = await status_service.get_report_status_timeline(db, report_id)
+        timeline = await status_service.get_report_status_timeline(db, report_id, report)
         return timeline
     except HTTPException:
         raise
@@ -1089,32 +1172,18 @@ async def resolve_report(
                 detail="Admin verification image must be an image (JPEG/PNG)"
             )
         
-        # Validate file size (10MB limit)
-        content = await resolution_image.read()
-        file_size = len(content)
-        
-        if file_size > 10 * 1024 * 1024:  # 10MB
+        # Validate file sizes (10MB limit) without reading the uploads into memory
+        if upload_size(resolution_image) > MAX_IMAGE_BYTES:
             raise HTTPException(
                 status_code=400,
                 detail="Resolution image size must be less than 10MB"
             )
         
-        # Validate admin verification image size if provided
-        if admin_verification_image:
-            admin_content = await admin_verification_image.read()
-            admin_file_size = len(admin_content)
-            
-            if admin_file_size > 10 * 1024 * 1024:  # 10MB
-                raise HTTPException(
-                    status_code=400,
-                    detail="Admin verification image size must be less than 10MB"
-                )
-            
-            # Reset admin verification image pointer
-            await admin_verification_image.seek(0)
-        
-        # Reset resolution image pointer
-        await resolution_image.seek(0)
+        if admin_verification_image and upload_size(admin_verification_image) > MAX_IMAGE_BYTES:
+            raise HTTPException(
+                status_code=400,
+                detail="Admin verification image size must be less than 10MB"
+            )
         
         # Resolve the report
         result = await resolution_service.resolve_report(
@@ -1126,33 +1195,35 @@ async def resolve_report(
         resolution_coords = {}
         if result.get("resolution_coordinates"):
             try:
-                resolution_coords = json.loads(result["resolution_coordinates"])
-            except json.JSONDecodeError:
+                resolution_coords = orjson.loads(result["resolution_coordinates"])
+            except orjson.JSONDecodeError:
                 resolution_coords = {}
         
-        # Broadcast resolution update via WebSocket
+        # Broadcast the resolution and the status change (for clients tracking
+        # status changes) via WebSocket in one concurrent fan-out
         if result.get("success"):
-            await websocket_manager.broadcast_resolution_update(
-                report_id=report_id,
-                evidence_url=result.get("resolution_image_url", ""),
-                admin_coordinates={
-                    "lat": resolution_coords.get("latitude", 0),
-                    "lng": resolution_coords.get("longitude", 0)
-                },
-                distance_meters=result.get("distance_meters", 0)
-            )
-            # Also broadcast a status update for clients tracking status changes
-            try:
-                await websocket_manager.broadcast_status_update(
+            department_service.invalidate_department_stats()
+            invalidate_citizen_reviews()
+            await asyncio.gather(
+                websocket_manager.broadcast_resolution_update(
+                    report_id=report_id,
+                    evidence_url=result.get("resolution_image_url", ""),
+                    admin_coordinates={
+                        "lat": resolution_coords.get("latitude", 0),
+                        "lng": resolution_coords.get("longitude", 0)
+                    },
+                    distance_meters=result.get("distance_meters", 0)
+                ),
+                websocket_manager.broadcast_status_update(
                     report_id=report_id,
                     old_status=result.get("status_update", {}).get("old_status", "in_progress"),
                     new_status="resolved",
                     changed_by=current_admin.full_name or current_admin.email,
                     timestamp=datetime.utcnow().isoformat(),
                     notes=result.get("status_update", {}).get("notes", "Resolved with geo-verified evidence")
-                )
-            except Exception:
-                pass
+                ),
+                return_exceptions=True
+            )
         
         # Gamification: resolved by admin shouldn't change citizen points directly
         try:
@@ -1244,8 +1315,11 @@ async def verify_face_endpoint(
         else:
             who_id = current_user.id
 
+        # Decode once; the same bytes are verified and, on success, stored
+        raw = face_verification_service.decode_base64_image(data.image_base64)
+
         # Run verification
-        result = await face_verification_service.verify_face(data.image_base64)
+        result = await face_verification_service.verify_face_bytes(raw)
         
         # More lenient verification - accept if either method succeeds
         if not result.face_detected_locally and not result.openai_confirms_human:
@@ -1256,8 +1330,6 @@ async def verify_face_endpoint(
             )
 
         # Store verification image
-        import base64 as _b64
-        raw = _b64.b64decode(data.image_base64.split(",", 1)[1] if "," in data.image_base64 else data.image_base64)
         image_url = await storage_service.upload_face_verification_image(image_bytes=raw, report_id=report_id, who_id=who_id)
 
         # Persist record
@@ -1269,16 +1341,17 @@ async def verify_face_endpoint(
             face_verified=True,
         )
         db.add(fv)
-        db.commit()
-        db.refresh(fv)
-
-        return FaceVerifyResponse(
+        db.flush()  # RETURNING fills verified_at
+        response = FaceVerifyResponse(
             success=True,
             face_detected=True,
             openai_human=True,
             image_url=image_url,
             verified_at=fv.verified_at,
         )
+        db.commit()
+
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -1314,18 +1387,11 @@ async def get_report_resolution(
 async def get_public_report_resolution(
     report_id: int,
     db = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    report: Report = Depends(get_accessible_report)
 ):
     """Get resolution details for a report for the reporter or any admin"""
     try:
-        # Verify access
-        report = db.query(Report).filter(Report.id == report_id).first()
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-        if report.reporter_id != current_user.id and current_user.role != "admin":
-            raise HTTPException(status_code=403, detail="Access denied")
-
-        resolution_details = await resolution_service.get_resolution_details(db, report_id)
+        resolution_details = await resolution_service.get_resolution_details(db, report_id, report)
         if not resolution_details:
             raise HTTPException(status_code=404, detail="Resolution details not found")
 
@@ -1340,31 +1406,40 @@ async def get_public_report_resolution(
         )
 
 # Citizen Report Management Endpoints
+# Handlers that only touch the sync Session are plain `def`, so FastAPI runs
+# them in its threadpool instead of blocking the event loop
 
 @app.get("/citizen/reports", response_model=List[ReportResponse])
-async def get_citizen_reports(
+def get_citizen_reports(
     db = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all non-deleted reports submitted by the current citizen"""
     try:
-        reports = db.query(Report).filter(
+        # Ratings come back in the same round trip. report_ratings does not enforce one
+        # rating per report, so join only the latest one to keep one row per report
+        # Status history and per-stage timestamps are not part of this response
+        latest_rating_id = select(func.max(ReportRating.id)).where(
+            ReportRating.report_id == Report.id
+        ).correlate(Report).scalar_subquery()
+        rows = db.query(Report, ReportRating).outerjoin(
+            ReportRating, ReportRating.id == latest_rating_id
+        ).options(load_only(
+            Report.id, Report.title, Report.description, Report.category, Report.image_url,
+            Report.latitude, Report.longitude, Report.ai_generated_title,
+            Report.ai_generated_description, Report.ai_tags, Report.urgency_score,
+            Report.urgency_label, Report.mcq_responses, Report.reporter_id, Report.status,
+            Report.admin_notes, Report.resolved_by, Report.resolved_at,
+            Report.resolution_image_url, Report.resolution_coordinates, Report.is_deleted,
+            Report.deletion_reason, Report.deleted_at, Report.created_at, Report.updated_at
+        )).filter(
             Report.reporter_id == current_user.id,
             Report.is_deleted == False
         ).order_by(Report.created_at.desc()).all()
-        
-        # Preload ratings to avoid N+1 queries
-        report_ids = [r.id for r in reports]
-        ratings_map = {}
-        if report_ids:
-            rows = db.query(ReportRating).filter(ReportRating.report_id.in_(report_ids)).all()
-            for rr in rows:
-                ratings_map[rr.report_id] = rr
 
         # Convert reports to response format with proper timezone handling
         response_reports = []
-        for report in reports:
-            rr = ratings_map.get(report.id)
+        for report, rr in rows:
             report_dict = {
                 "id": report.id,
                 "title": report.title,
@@ -1406,7 +1481,7 @@ async def get_citizen_reports(
         )
 
 @app.post("/citizen/replies", response_model=CitizenReplyResponse)
-async def create_citizen_reply(
+def create_citizen_reply(
     reply_data: CitizenReplyCreate,
     db = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -1414,12 +1489,12 @@ async def create_citizen_reply(
     """Create a new reply to a report"""
     try:
         # Verify the report exists and belongs to the user
-        report = db.query(Report).filter(
+        report_exists = db.execute(select(exists().where(
             Report.id == reply_data.report_id,
             Report.reporter_id == current_user.id
-        ).first()
+        ))).scalar()
         
-        if not report:
+        if not report_exists:
             raise HTTPException(
                 status_code=404,
                 detail="Report not found or access denied"
@@ -1433,10 +1508,11 @@ async def create_citizen_reply(
         )
         
         db.add(reply)
+        db.flush()  # RETURNING fills id/created_at
+        response = CitizenReplyResponse.model_validate(reply)
         db.commit()
-        db.refresh(reply)
         
-        return CitizenReplyResponse.model_validate(reply)
+        return response
         
     except HTTPException:
         raise
@@ -1448,30 +1524,29 @@ async def create_citizen_reply(
         )
 
 @app.get("/reports/{report_id}/replies", response_model=List[CitizenReplyResponse])
-async def get_report_replies(
+def get_report_replies(
     report_id: int,
     db = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all replies for a specific report"""
     try:
-        # Verify the report exists and belongs to the user
-        report = db.query(Report).filter(
+        # Ownership check and replies in one query: no rows means the report is
+        # missing or not the user's; a report without replies yields one (id, None) row
+        rows = db.query(Report.id, CitizenReply).outerjoin(
+            CitizenReply, CitizenReply.report_id == Report.id
+        ).filter(
             Report.id == report_id,
             Report.reporter_id == current_user.id
-        ).first()
+        ).order_by(CitizenReply.created_at.asc()).all()
         
-        if not report:
+        if not rows:
             raise HTTPException(
                 status_code=404,
                 detail="Report not found or access denied"
             )
         
-        replies = db.query(CitizenReply).filter(
-            CitizenReply.report_id == report_id
-        ).order_by(CitizenReply.created_at.asc()).all()
-        
-        return [CitizenReplyResponse.model_validate(reply) for reply in replies]
+        return [CitizenReplyResponse.model_validate(reply) for _, reply in rows if reply is not None]
         
     except HTTPException:
         raise
@@ -1483,7 +1558,7 @@ async def get_report_replies(
         )
 
 @app.post("/citizen/ratings", response_model=ReportRatingResponse)
-async def create_report_rating(
+def create_report_rating(
     rating_data: ReportRatingCreate,
     db = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -1491,24 +1566,24 @@ async def create_report_rating(
     """Rate a resolved report"""
     try:
         # Verify the report exists, belongs to the user, and is resolved
-        report = db.query(Report).filter(
+        report_exists = db.execute(select(exists().where(
             Report.id == rating_data.report_id,
             Report.reporter_id == current_user.id,
             Report.status == "resolved"
-        ).first()
+        ))).scalar()
         
-        if not report:
+        if not report_exists:
             raise HTTPException(
                 status_code=404,
                 detail="Resolved report not found or access denied"
             )
         
         # Check if rating already exists
-        existing_rating = db.query(ReportRating).filter(
+        already_rated = db.execute(select(exists().where(
             ReportRating.report_id == rating_data.report_id
-        ).first()
+        ))).scalar()
         
-        if existing_rating:
+        if already_rated:
             raise HTTPException(
                 status_code=400,
                 detail="Report has already been rated"
@@ -1522,10 +1597,13 @@ async def create_report_rating(
         )
         
         db.add(rating)
+        db.flush()  # RETURNING fills id/created_at
+        response = ReportRatingResponse.model_validate(rating)
         db.commit()
-        db.refresh(rating)
+        invalidate_review_stats()
+        invalidate_citizen_reviews()
         
-        return ReportRatingResponse.model_validate(rating)
+        return response
         
     except HTTPException:
         raise
@@ -1537,7 +1615,7 @@ async def create_report_rating(
         )
 
 @app.delete("/citizen/reports/{report_id}")
-async def delete_citizen_report(
+def delete_citizen_report(
     report_id: int,
     deletion_data: ReportDeletionRequest,
     db = Depends(get_db),
@@ -1570,6 +1648,8 @@ async def delete_citizen_report(
         report.status = "deleted"
         
         db.commit()
+        department_service.invalidate_department_stats()
+        invalidate_citizen_reviews()
         
         return {"message": "Report deleted successfully"}
         
@@ -1585,34 +1665,13 @@ async def delete_citizen_report(
 # Admin Review Endpoints
 
 @app.get("/admin/reviews")
-async def get_citizen_reviews(
+def get_citizen_reviews(
     db = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """Get all citizen reviews and ratings for admin dashboard"""
     try:
-        # Get all ratings with report and user information
-        ratings = db.query(ReportRating, Report, User).join(
-            Report, ReportRating.report_id == Report.id
-        ).join(
-            User, Report.reporter_id == User.id
-        ).order_by(ReportRating.created_at.desc()).all()
-        
-        reviews = []
-        for rating, report, user in ratings:
-            reviews.append({
-                "id": rating.id,
-                "report_id": rating.report_id,
-                "report_title": report.title,
-                "category": report.category,
-                "citizen_name": user.full_name,
-                "rating": rating.rating,
-                "feedback": rating.feedback,
-                "created_at": rating.created_at,
-                "resolved_at": report.resolved_at,
-                "resolved_by": report.resolved_by,
-                "department": current_admin.department_name or "General"
-            })
+        reviews = get_cached_citizen_reviews(db, current_admin.department_name or "General")
         
         return reviews
         
@@ -1624,16 +1683,15 @@ async def get_citizen_reviews(
         )
 
 @app.get("/admin/reviews/stats")
-async def get_review_stats(
+def get_review_stats(
     db = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """Get review statistics for admin dashboard"""
     try:
-        # Get all ratings
-        ratings = db.query(ReportRating).all()
+        stats = get_cached_review_stats(db)
         
-        if not ratings:
+        if stats is None:
             return {
                 "total_reviews": 0,
                 "average_rating": 0,
@@ -1643,34 +1701,10 @@ async def get_review_stats(
                 "recent_trend": "stable"
             }
         
-        # Calculate statistics
-        total_reviews = len(ratings)
-        average_rating = sum(r.rating for r in ratings) / total_reviews
-        
-        rating_distribution = {i: 0 for i in range(1, 6)}
-        for rating in ratings:
-            rating_distribution[rating.rating] += 1
-        
-        # Get category ratings
-        category_ratings = {}
-        for rating in ratings:
-            report = db.query(Report).filter(Report.id == rating.report_id).first()
-            if report:
-                if report.category not in category_ratings:
-                    category_ratings[report.category] = []
-                category_ratings[report.category].append(rating.rating)
-        
-        # Calculate average for each category
-        for category in category_ratings:
-            category_ratings[category] = sum(category_ratings[category]) / len(category_ratings[category])
-        
         return {
-            "total_reviews": total_reviews,
-            "average_rating": round(average_rating, 1),
-            "rating_distribution": rating_distribution,
-            "category_ratings": category_ratings,
+            **stats,
             "department_performance": {
-                current_admin.department_name or "General": round(average_rating, 1)
+                current_admin.department_name or "General": stats["average_rating"]
             },
             "recent_trend": "up"  # This could be calculated based on recent vs older ratings
         }
@@ -1682,224 +1716,12 @@ async def get_review_stats(
             detail="Internal server error while getting review stats"
         )
 
-# Community Endpoints
-@app.get("/reports/community", response_model=List[CommunityReport])
-async def get_community_reports(
-    skip: int = 0,
-    limit: int = 50,
-    sort: Optional[str] = "upvotes",
-    db = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Fetch reports in user's municipality/local area with upvotes and comments count."""
-    try:
-        # For now, approximate by municipality_name on reporter user, else return all
-        # Fetch base reports (non-deleted)
-        base_query = db.query(Report).filter(Report.is_deleted == False)
-
-        reports = base_query.all()
-
-        # Preload counts to minimize queries
-        report_ids = [r.id for r in reports]
-        upvote_counts = {rid: 0 for rid in report_ids}
-        comment_counts = {rid: 0 for rid in report_ids}
-
-        if report_ids:
-            from sqlalchemy import func
-            upvote_rows = db.query(ReportUpvote.report_id, func.count(ReportUpvote.id)).filter(ReportUpvote.report_id.in_(report_ids)).group_by(ReportUpvote.report_id).all()
-            for rid, cnt in upvote_rows:
-                upvote_counts[rid] = cnt
-
-            comment_rows = db.query(ReportComment.report_id, func.count(ReportComment.id)).filter(ReportComment.report_id.in_(report_ids)).group_by(ReportComment.report_id).all()
-            for rid, cnt in comment_rows:
-                comment_counts[rid] = cnt
-
-        # Sort
-        def sort_key(r: Report):
-            if sort == "latest":
-                return (r.created_at or datetime.min, upvote_counts.get(r.id, 0))
-            elif sort == "urgency":
-                return (r.urgency_score or 0, upvote_counts.get(r.id, 0))
-            else:  # upvotes default
-                return (upvote_counts.get(r.id, 0), r.created_at or datetime.min)
-
-        reports_sorted = sorted(reports, key=sort_key, reverse=True)
-        reports_paginated = reports_sorted[skip: skip + limit]
-
-        # Build response with reporter names and whether current user has upvoted
-        user_upvoted = set()
-        if report_ids:
-            rows = db.query(ReportUpvote.report_id).filter(
-                ReportUpvote.report_id.in_(report_ids),
-                ReportUpvote.user_id == current_user.id
-            ).all()
-            user_upvoted = {r[0] for r in rows}
-
-        # Build response with reporter names
-        user_map = {}
-        result: List[CommunityReport] = []
-        for r in reports_paginated:
-            reporter_name = None
-            if r.reporter_id:
-                if r.reporter_id not in user_map:
-                    user_obj = db.query(User).filter(User.id == r.reporter_id).first()
-                    user_map[r.reporter_id] = user_obj.full_name if user_obj else None
-                reporter_name = user_map.get(r.reporter_id)
-            result.append(CommunityReport(
-                id=r.id,
-                title=r.title,
-                category=r.category,
-                reporter_name=reporter_name,
-                status=r.status,
-                upvotes=upvote_counts.get(r.id, 0),
-                comments_count=comment_counts.get(r.id, 0),
-                urgency_score=r.urgency_score or 0,
-                created_at=r.created_at,
-                ai_generated_title=r.ai_generated_title,
-                ai_generated_description=r.ai_generated_description,
-                image_url=r.image_url,
-                user_has_upvoted=(r.id in user_upvoted)
-            ))
-
-        return result
-    except Exception as e:
-        logger.error(f"Error fetching community reports: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-
-
-@app.post("/reports/{report_id}/upvote", response_model=UpvoteResponse)
-async def toggle_upvote(
-    report_id: int,
-    db = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Toggle upvote for a report by the current user."""
-    try:
-        report = db.query(Report).filter(Report.id == report_id, Report.is_deleted == False).first()
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-
-        existing = db.query(ReportUpvote).filter(
-            ReportUpvote.report_id == report_id,
-            ReportUpvote.user_id == current_user.id
-        ).first()
-
-        action = "added"
-        if existing:
-            db.delete(existing)
-            action = "removed"
-        else:
-            db.add(ReportUpvote(report_id=report_id, user_id=current_user.id))
-
-        db.commit()
-
-        from sqlalchemy import func
-        total_upvotes = db.query(func.count(ReportUpvote.id)).filter(ReportUpvote.report_id == report_id).scalar() or 0
-
-        # Broadcast via websocket
-        try:
-            await websocket_manager.broadcast_upvote_update(report_id, total_upvotes, current_user.id, action)
-        except Exception:
-            pass
-
-        return UpvoteResponse(
-            message="Upvote removed successfully" if action == "removed" else "Upvote added successfully",
-            total_upvotes=total_upvotes,
-            user_has_upvoted=(action == "added")
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error toggling upvote: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-
-
-@app.get("/reports/{report_id}/comments", response_model=List[CommentResponse])
-async def get_report_comments(
-    report_id: int,
-    db = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get all comments for a report (public to authenticated users)."""
-    try:
-        report = db.query(Report).filter(Report.id == report_id, Report.is_deleted == False).first()
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-
-        comments = db.query(ReportComment).filter(ReportComment.report_id == report_id).order_by(ReportComment.created_at.desc()).all()
-
-        # Attach user_name
-        user_names = {}
-        responses: List[CommentResponse] = []
-        for c in comments:
-            if c.user_id not in user_names:
-                u = db.query(User).filter(User.id == c.user_id).first()
-                user_names[c.user_id] = u.full_name if u else None
-            responses.append(CommentResponse(
-                id=c.id,
-                report_id=c.report_id,
-                user_id=c.user_id,
-                user_name=user_names.get(c.user_id),
-                comment=c.comment,
-                created_at=c.created_at
-            ))
-        return responses
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching comments: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-
-
-@app.post("/reports/{report_id}/comments", response_model=CommentResponse)
-async def add_report_comment(
-    report_id: int,
-    data: CommentCreate,
-    db = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Add a new comment to a report."""
-    try:
-        report = db.query(Report).filter(Report.id == report_id, Report.is_deleted == False).first()
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-
-        comment = ReportComment(report_id=report_id, user_id=current_user.id, comment=data.comment)
-        db.add(comment)
-        db.commit()
-        db.refresh(comment)
-
-        # Broadcast via websocket
-        try:
-            await websocket_manager.broadcast_comment_new(
-                report_id=report_id,
-                comment_id=comment.id,
-                user_id=current_user.id,
-                comment=comment.comment,
-                created_at=comment.created_at.isoformat(),
-                user_name=current_user.full_name
-            )
-        except Exception:
-            pass
-
-        return CommentResponse(
-            id=comment.id,
-            report_id=comment.report_id,
-            user_id=comment.user_id,
-            user_name=current_user.full_name,
-            comment=comment.comment,
-            created_at=comment.created_at
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error adding comment: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8000)),
-        reload=True
+        reload=True,
+        loop="asyncio" if os.name == "nt" else "uvloop",
+        http="httptools"
     )
\ No newline at end of file
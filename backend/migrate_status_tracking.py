@@ -52,26 +52,31 @@ def migrate_database():
             )
         """)
         
-        # Create initial status history entries for existing reports
-        cursor.execute("SELECT id, status, created_at, reporter_id FROM reports")
-        reports = cursor.fetchall()
+        # Create initial status history entries for reports that have none,
+        # set-based so the whole backfill is two statements in this transaction
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM report_status_history")
+        last_history_id = cursor.fetchone()[0]
         
-        for report_id, status, created_at, reporter_id in reports:
-            # Check if status history already exists for this report
-            cursor.execute("SELECT COUNT(*) FROM report_status_history WHERE report_id = ?", (report_id,))
-            if cursor.fetchone()[0] == 0:
-                # Create initial "reported" status entry
-                cursor.execute("""
-                    INSERT INTO report_status_history (report_id, status, changed_by, changed_at, notes)
-                    VALUES (?, 'reported', ?, ?, 'Issue reported by citizen')
-                """, (report_id, reporter_id, created_at))
-                
-                # Create additional status entries if status is not "reported"
-                if status in ['acknowledged', 'in_progress', 'resolved']:
-                    cursor.execute("""
-                        INSERT INTO report_status_history (report_id, status, changed_by, changed_at, notes)
-                        VALUES (?, ?, ?, ?, 'Status updated by admin')
-                    """, (report_id, status, 'system', created_at))
+        cursor.execute("""
+            INSERT INTO report_status_history (report_id, status, changed_by, changed_at, notes)
+            SELECT r.id, 'reported', r.reporter_id, r.created_at, 'Issue reported by citizen'
+            FROM reports r
+            WHERE NOT EXISTS (
+                SELECT 1 FROM report_status_history h WHERE h.report_id = r.id
+            )
+            ORDER BY r.id
+        """)
+        
+        # Follow the rows just created with the report's current status if it moved past "reported"
+        cursor.execute("""
+            INSERT INTO report_status_history (report_id, status, changed_by, changed_at, notes)
+            SELECT r.id, r.status, 'system', r.created_at, 'Status updated by admin'
+            FROM report_status_history h
+            JOIN reports r ON r.id = h.report_id
+            WHERE h.id > ?
+              AND r.status IN ('acknowledged', 'in_progress', 'resolved')
+            ORDER BY r.id
+        """, (last_history_id,))
         
         # Update status field to use new status values
         cursor.execute("""
@@ -87,6 +92,9 @@ def migrate_database():
         conn.commit()
         print("Database migration completed successfully!")
         
+        # Refresh planner statistics after the schema and data changes
+        cursor.execute("PRAGMA optimize")
+        
     except Exception as e:
         print(f"Error during migration: {e}")
         conn.rollback()
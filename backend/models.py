@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from pydantic_core import core_schema
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from bson import ObjectId
@@ -10,8 +11,9 @@ class UserRole(enum.Enum):
 
 class PyObjectId(ObjectId):
     @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+    def __get_pydantic_core_schema__(cls, source, handler):
+        # Plain validator compiled into pydantic-core, no v1 compatibility shim
+        return core_schema.no_info_plain_validator_function(cls.validate)
 
     @classmethod
     def validate(cls, v):
@@ -20,8 +22,8 @@ class PyObjectId(ObjectId):
         return ObjectId(v)
 
     @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {"type": "string"}
 
 class Report(BaseModel):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
@@ -140,9 +142,13 @@ class CategoryDepartmentMapping(Base):
 
 class CitizenReply(Base):
     __tablename__ = "citizen_replies"
+    __table_args__ = (
+        # Replies of one report in chronological order
+        Index("ix_citizen_replies_report_created", "report_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    report_id = Column(Integer, nullable=False)
+    report_id = Column(Integer, nullable=False, index=True)
     message = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_admin_reply = Column(Boolean, default=False)
@@ -155,7 +161,7 @@ class ReportRating(Base):
     __tablename__ = "report_ratings"
     
     id = Column(Integer, primary_key=True, index=True)
-    report_id = Column(Integer, nullable=False)
+    report_id = Column(Integer, nullable=False, index=True)
     rating = Column(Integer, nullable=False)  # 1-5 stars
     feedback = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -167,7 +173,7 @@ class ReportDeletion(Base):
     __tablename__ = "report_deletions"
     
     id = Column(Integer, primary_key=True, index=True)
-    report_id = Column(Integer, nullable=False)
+    report_id = Column(Integer, nullable=False, index=True)
     reason = Column(String(255), nullable=False)
     deleted_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -205,6 +211,10 @@ class ReportUpvote(Base):
 
 class ReportComment(Base):
     __tablename__ = "report_comments"
+    __table_args__ = (
+        # Comments of one report, newest first
+        Index("ix_report_comments_report_created", "report_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     report_id = Column(Integer, nullable=False, index=True)
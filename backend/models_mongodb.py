@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from pydantic_core import core_schema
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from bson import ObjectId
@@ -10,8 +11,9 @@ class UserRole(enum.Enum):
 
 class PyObjectId(ObjectId):
     @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+    def __get_pydantic_core_schema__(cls, source, handler):
+        # Plain validator compiled into pydantic-core, no v1 compatibility shim
+        return core_schema.no_info_plain_validator_function(cls.validate)
 
     @classmethod
     def validate(cls, v):
@@ -20,8 +22,8 @@ class PyObjectId(ObjectId):
         return ObjectId(v)
 
     @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {"type": "string"}
 
 class Report(BaseModel):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
@@ -0,0 +1,9 @@
+"""
+Password hashing shared by the admin and test-user seeding scripts
+"""
+
+import hashlib
+
+def hash_password(password: str) -> str:
+    """Hash password using SHA-256"""
+    return hashlib.sha256(password.encode()).hexdigest()
@@ -15,6 +15,7 @@ from schemas import (
     RefreshTokenRequest, UserResponse, UserProfileUpdate
 )
 from services.auth_service import auth_service
+from services.review_cache import invalidate_citizen_reviews
 from models import User
 
 logger = logging.getLogger(__name__)
@@ -211,6 +212,9 @@ async def update_user_profile(
     """Update current user's profile information"""
     try:
         updated_user = await auth_service.update_user_profile(db, current_user.id, profile_data)
+        # The admin review listing shows reporter names
+        if profile_data.full_name is not None:
+            invalidate_citizen_reviews()
         return UserResponse.model_validate(updated_user)
     except ValueError as e:
         raise HTTPException(
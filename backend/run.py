@@ -4,16 +4,33 @@ Development server runner for CrowdCare FastAPI backend.
 """
 import uvicorn
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# uvloop/httptools ship with uvicorn[standard]; uvloop has no Windows build
+UVICORN_LOOP = "asyncio" if sys.platform == "win32" else "uvloop"
+
 if __name__ == "__main__":
+    # WebSocket subscriptions and the read caches (department lists/stats, review
+    # stats and listing, gamification points) live in process memory and are only
+    # invalidated in the worker that handled the write. Keep one worker unless clients
+    # are pinned to a worker and up-to-TTL staleness (30-300 s) is acceptable; with
+    # WORKERS > 1 the points cache is bypassed so totals don't flip between workers
+    workers = int(os.getenv("WORKERS", "1"))
+    # The reloader only supports a single worker process
+    reload = os.getenv("RELOAD", "true").lower() == "true" and workers == 1
+    
     uvicorn.run(
         "main:app",
         host=os.getenv("HOST", "0.0.0.0"),
         port=int(os.getenv("PORT", 8000)),
-        reload=True,
-        log_level="info"
+        reload=reload,
+        workers=workers,
+        loop=UVICORN_LOOP,
+        http="httptools",
+        ws_per_message_deflate=True,
+        log_level=os.getenv("LOG_LEVEL", "info")
     )
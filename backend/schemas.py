@@ -198,6 +198,26 @@ class CategoryDepartmentMappingResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DepartmentIssueResponse(BaseModel):
+    id: int
+    title: str
+    category: str
+    description: Optional[str] = None
+    latitude: float
+    longitude: float
+    urgency_score: float
+    urgency_label: str
+    status: str
+    created_at: datetime
+    image_url: Optional[str] = None
+    ai_generated_title: Optional[str] = None
+    ai_generated_description: Optional[str] = None
+    mcq_responses: Optional[str] = None
+    reporter_name: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
 # Citizen Reply Schemas
 class CitizenReplyCreate(BaseModel):
     report_id: int
@@ -47,26 +47,42 @@ class AIService:
     def __init__(self):
         self.ai_api_url = os.getenv("AI_API_URL", "http://localhost:8001")
         self.timeout = 30.0
+        # Shared client so calls reuse pooled keep-alive connections; created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the pooled HTTP client (app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     async def generate_summary(self, request: AISummaryRequest) -> AISummaryResponse:
         """
         Generate AI-powered title and description for a report
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.ai_api_url}/summarize",
-                    json=request.dict()
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                return AISummaryResponse(
-                    title=data.get("title", ""),
-                    description=data.get("description", ""),
-                    tags=data.get("tags", [])
-                )
-                
+            client = self._get_client()
+            response = await client.post(
+                f"{self.ai_api_url}/summarize",
+                json=request.dict()
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            return AISummaryResponse(
+                title=data.get("title", ""),
+                description=data.get("description", ""),
+                tags=data.get("tags", [])
+            )
+            
         except httpx.TimeoutException:
             logger.error("AI service timeout for summary generation")
             return self._fallback_summary(request)
@@ -105,20 +121,20 @@ class AIService:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.ai_api_url}/classify",
-                    json=analysis_data
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                return AIClassificationResponse(
-                    urgency_score=data.get("urgency_score", 50),
-                    urgency_label=data.get("urgency_label", "Medium"),
-                    reasoning=data.get("reasoning")
-                )
-                
+            client = self._get_client()
+            response = await client.post(
+                f"{self.ai_api_url}/classify",
+                json=analysis_data
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            return AIClassificationResponse(
+                urgency_score=data.get("urgency_score", 50),
+                urgency_label=data.get("urgency_label", "Medium"),
+                reasoning=data.get("reasoning")
+            )
+            
         except httpx.TimeoutException:
             logger.error("AI service timeout for urgency classification")
             return self._advanced_fallback_classification(request)
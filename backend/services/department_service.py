@@ -3,16 +3,28 @@ Department Management Service for CrowdCare
 Handles department categories and category-department mappings
 """
 
+import asyncio
 import logging
-from sqlalchemy.orm import Session
+import time
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional, Dict
 from models import DepartmentCategory, CategoryDepartmentMapping, Report, User
 from sqlalchemy import func
 
 logger = logging.getLogger(__name__)
 
+# Departments change only through initialize_departments, which clears the cache
+DEPARTMENTS_TTL_SECONDS = 300.0
+# Dashboards poll stats; status changes clear the cache, the TTL bounds anything else
+DEPARTMENT_STATS_TTL_SECONDS = 30.0
+
 class DepartmentService:
     def __init__(self):
+        # (expires_at, rows) for the active departments list
+        self._departments_cache: Optional[tuple] = None
+        # department_name -> (expires_at, stats)
+        self._stats_cache: Dict[str, tuple] = {}
+        
         # Initialize default department categories and mappings
         self.default_departments = [
             {"name": "Garbage", "description": "Waste management and sanitation"},
@@ -57,6 +69,10 @@ class DepartmentService:
         ]
     
     async def initialize_departments(self, db: Session) -> bool:
+        """Initialize default departments and category mappings (off the event loop)"""
+        return await asyncio.to_thread(self.initialize_departments_sync, db)
+    
+    def initialize_departments_sync(self, db: Session) -> bool:
         """Initialize default departments and category mappings"""
         try:
             # Create default departments
@@ -89,6 +105,7 @@ class DepartmentService:
                     logger.info(f"Created mapping: {mapping_data['category']} -> {mapping_data['department']}")
             
             db.commit()
+            self.invalidate_departments_cache()
             logger.info("Department initialization completed successfully")
             return True
             
@@ -97,6 +114,29 @@ class DepartmentService:
             logger.error(f"Error initializing departments: {e}")
             return False
     
+    def get_active_departments(self, db: Session) -> List[Dict]:
+        """Active departments as plain dicts, served from memory within the TTL"""
+        now = time.monotonic()
+        if self._departments_cache and self._departments_cache[0] > now:
+            return self._departments_cache[1]
+        
+        rows = db.query(
+            DepartmentCategory.id, DepartmentCategory.name, DepartmentCategory.description
+        ).filter(DepartmentCategory.is_active == True).all()
+        departments = [
+            {"id": row.id, "name": row.name, "description": row.description}
+            for row in rows
+        ]
+        self._departments_cache = (now + DEPARTMENTS_TTL_SECONDS, departments)
+        return departments
+    
+    def invalidate_departments_cache(self) -> None:
+        self._departments_cache = None
+    
+    def invalidate_department_stats(self) -> None:
+        """Drop cached stats for every department (a status change can move any of them)"""
+        self._stats_cache.clear()
+    
     async def get_department_by_category(self, db: Session, category: str) -> Optional[str]:
         """Get department name for a given category"""
         try:
@@ -114,6 +154,15 @@ class DepartmentService:
             logger.error(f"Error getting department for category {category}: {e}")
             return "General"
     
+    def _issue_list_query(self, db: Session):
+        """Report query limited to the columns the department issue lists return"""
+        return db.query(Report).options(load_only(
+            Report.id, Report.title, Report.category, Report.description,
+            Report.latitude, Report.longitude, Report.urgency_score, Report.urgency_label,
+            Report.status, Report.created_at, Report.image_url, Report.ai_generated_title,
+            Report.ai_generated_description, Report.mcq_responses, Report.reporter_id
+        ))
+    
     async def get_reports_by_department(self, db: Session, department_name: str, 
                                       status_filter: Optional[str] = None,
                                       urgency_filter: Optional[str] = None) -> List[Report]:
@@ -127,7 +176,7 @@ class DepartmentService:
             category_list = [cat[0] for cat in categories]
             
             # Query reports
-            query = db.query(Report).filter(Report.category.in_(category_list))
+            query = self._issue_list_query(db).filter(Report.category.in_(category_list))
             
             # Apply filters
             if status_filter:
@@ -159,7 +208,7 @@ class DepartmentService:
             category_list = [cat[0] for cat in categories]
             
             # Query reports
-            query = db.query(Report).filter(Report.category.in_(category_list))
+            query = self._issue_list_query(db).filter(Report.category.in_(category_list))
             
             # Apply filters
             if status_filter:
@@ -179,39 +228,16 @@ class DepartmentService:
             return []
     
     async def get_department_stats(self, db: Session, department_name: str) -> Dict:
-        """Get statistics for a department"""
+        """Get statistics for a department, served from memory within the TTL"""
+        now = time.monotonic()
+        cached = self._stats_cache.get(department_name)
+        if cached and cached[0] > now:
+            return cached[1]
+        
         try:
-            # Get categories for this department
-            categories = db.query(CategoryDepartmentMapping.category).filter(
-                CategoryDepartmentMapping.department_name == department_name
-            ).all()
-            
-            category_list = [cat[0] for cat in categories]
-            
-            # Count reports by status
-            stats = db.query(
-                Report.status,
-                func.count(Report.id)
-            ).filter(
-                Report.category.in_(category_list)
-            ).group_by(Report.status).all()
-            
-            # Convert to dictionary
-            status_counts = {status: count for status, count in stats}
-            
-            # Get total count
-            total_reports = sum(status_counts.values())
-            
-            return {
-                "department": department_name,
-                "total_reports": total_reports,
-                "status_breakdown": status_counts,
-                "pending": status_counts.get("pending", 0),
-                "in_progress": status_counts.get("in_progress", 0),
-                "resolved": status_counts.get("resolved", 0)
-            }
-            
+            stats = self._compute_department_stats(db, department_name)
         except Exception as e:
+            # Not cached, so the next poll retries
             logger.error(f"Error getting stats for department {department_name}: {e}")
             return {
                 "department": department_name,
@@ -221,6 +247,40 @@ class DepartmentService:
                 "in_progress": 0,
                 "resolved": 0
             }
+        
+        self._stats_cache[department_name] = (now + DEPARTMENT_STATS_TTL_SECONDS, stats)
+        return stats
+    
+    def _compute_department_stats(self, db: Session, department_name: str) -> Dict:
+        # Get categories for this department
+        categories = db.query(CategoryDepartmentMapping.category).filter(
+            CategoryDepartmentMapping.department_name == department_name
+        ).all()
+        
+        category_list = [cat[0] for cat in categories]
+        
+        # Count reports by status
+        stats = db.query(
+            Report.status,
+            func.count(Report.id)
+        ).filter(
+            Report.category.in_(category_list)
+        ).group_by(Report.status).all()
+        
+        # Convert to dictionary
+        status_counts = {status: count for status, count in stats}
+        
+        # Get total count
+        total_reports = sum(status_counts.values())
+        
+        return {
+            "department": department_name,
+            "total_reports": total_reports,
+            "status_breakdown": status_counts,
+            "pending": status_counts.get("pending", 0),
+            "in_progress": status_counts.get("in_progress", 0),
+            "resolved": status_counts.get("resolved", 0)
+        }
 
 # Global department service instance
 department_service = DepartmentService()
@@ -2,7 +2,7 @@ import piexif
 from PIL import Image
 import io
 import logging
-from typing import Optional, Dict
+from typing import BinaryIO, Dict, Optional, Union
 
 logger = logging.getLogger(__name__)
 
@@ -35,27 +35,34 @@ def dms_to_decimal(dms_tuple: tuple, ref: str) -> float:
         logger.error(f"Error converting DMS to decimal: {e}")
         raise ValueError(f"Invalid DMS format: {dms_tuple}")
 
-async def extract_gps_from_image(image_bytes: bytes) -> Optional[Dict[str, float]]:
+async def extract_gps_from_image(image_bytes: Union[bytes, BinaryIO]) -> Optional[Dict[str, float]]:
     """
     Extract GPS coordinates from image EXIF data with enhanced error handling.
     
     Args:
-        image_bytes: Raw image bytes
+        image_bytes: Raw image bytes, or a seekable binary file positioned at the start
+            (PIL only reads the header and EXIF block from it, not the pixel data)
     
     Returns:
         Dictionary with 'latitude' and 'longitude' keys, or None if no GPS data found
     """
     try:
-        logger.info(f"Starting GPS extraction from image, size: {len(image_bytes)} bytes")
-        
-        # Validate input
-        if not image_bytes or len(image_bytes) == 0:
-            logger.warning("Empty image bytes provided")
-            return None
+        if isinstance(image_bytes, (bytes, bytearray)):
+            logger.info(f"Starting GPS extraction from image, size: {len(image_bytes)} bytes")
+            
+            # Validate input
+            if not image_bytes or len(image_bytes) == 0:
+                logger.warning("Empty image bytes provided")
+                return None
+            
+            image_source = io.BytesIO(image_bytes)
+        else:
+            logger.info("Starting GPS extraction from image file")
+            image_source = image_bytes
         
         # Open image from bytes
         try:
-            image = Image.open(io.BytesIO(image_bytes))
+            image = Image.open(image_source)
             logger.info(f"Image opened successfully, format: {image.format}, size: {image.size}")
         except Exception as e:
             logger.error(f"Failed to open image: {e}")
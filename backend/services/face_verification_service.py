@@ -4,6 +4,7 @@ Uses OpenCV for local face detection (if available) and OpenAI Vision for human
 Gracefully degrades to OpenAI-only verification when OpenCV is unavailable.
 """
 
+import asyncio
 import base64
 import io
 import logging
@@ -11,7 +12,8 @@ import os
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
-from openai import OpenAI  # type: ignore
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient  # type: ignore
 
 
 logger = logging.getLogger(__name__)
@@ -52,7 +54,13 @@ class FaceVerificationService:
         self.openai_available = False
         self.openai_client = None
         try:
-            self.openai_client = OpenAI()
+            # One pooled client for the process: keep-alive connections skip a TLS
+            # handshake per verification
+            self.openai_client = AsyncOpenAI(
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+                )
+            )
             self.openai_available = True
             logger.info("OpenAI client initialized successfully")
         except Exception as e:
@@ -61,27 +69,34 @@ class FaceVerificationService:
                 logger.error("Face verification requires either OpenAI API key, OpenCV, or FACE_VERIFICATION_BYPASS=true")
                 raise
 
-    def _decode_base64_image(self, image_base64: str):
-        """Decode base64 image; returns (opencv_image_or_None, raw_bytes)."""
+    async def aclose(self) -> None:
+        """Close the OpenAI client's connection pool (app shutdown)."""
+        if self.openai_client is not None:
+            await self.openai_client.close()
+
+    def decode_base64_image(self, image_base64: str) -> Optional[bytes]:
+        """Decode a base64 (optionally data URL) image to raw bytes; None if it is invalid."""
         try:
             # Strip data URL prefix if present
             if "," in image_base64 and image_base64.strip().startswith("data:"):
                 image_base64 = image_base64.split(",", 1)[1]
-            image_bytes = base64.b64decode(image_base64)
-            if self.opencv_available:
-                try:
-                    import numpy as np  # type: ignore
-                    import cv2  # type: ignore
-                    image_array = np.frombuffer(image_bytes, dtype=np.uint8)
-                    image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-                    return image, image_bytes
-                except Exception as e:
-                    logger.warning(f"Failed to decode image for OpenCV path; falling back to bytes only: {e}")
-            return None, image_bytes
+            return base64.b64decode(image_base64)
         except Exception as e:
             logger.warning(f"Error decoding base64 image: {e}")
-            # Return None for both image and bytes to indicate failure
-            return None, None
+            return None
+
+    def _decode_opencv_image(self, image_bytes: bytes):
+        """Decode raw bytes into an OpenCV image; None when OpenCV is unavailable or decoding fails."""
+        if not self.opencv_available:
+            return None
+        try:
+            import numpy as np  # type: ignore
+            import cv2  # type: ignore
+            image_array = np.frombuffer(image_bytes, dtype=np.uint8)
+            return cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+        except Exception as e:
+            logger.warning(f"Failed to decode image for OpenCV path; falling back to bytes only: {e}")
+            return None
 
     def _detect_face_opencv(self, image) -> bool:
         """Run local face detection using Haar cascades with strict parameters."""
@@ -130,6 +145,10 @@ class FaceVerificationService:
             logger.error(f"OpenCV face detection error: {e}")
             return False
 
+    def _detect_face_in_bytes(self, image_bytes: bytes) -> bool:
+        """Decode and run local face detection; CPU-bound, so callers run it in a worker thread."""
+        return self._detect_face_opencv(self._decode_opencv_image(image_bytes))
+
     async def _verify_with_openai(self, image_bytes: bytes) -> Tuple[bool, Optional[str]]:
         """Call OpenAI Vision to confirm the image contains a live human face."""
         if not self.openai_available or self.openai_client is None:
@@ -147,7 +166,7 @@ class FaceVerificationService:
                 "Return 'false' for anything else."
             )
 
-            resp = self.openai_client.chat.completions.create(
+            resp = await self.openai_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -189,8 +208,10 @@ class FaceVerificationService:
         Verify face presence and human-ness with strict accuracy.
         Requires at least one method to confirm a human face is present.
         """
-        image, image_bytes = self._decode_base64_image(image_base64)
-        
+        return await self.verify_face_bytes(self.decode_base64_image(image_base64))
+
+    async def verify_face_bytes(self, image_bytes: Optional[bytes]) -> FaceVerificationResult:
+        """Same as verify_face, for callers that already decoded the image."""
         # Validate that we have a reasonable image
         if image_bytes is None:
             logger.warning("Failed to decode image")
@@ -213,9 +234,9 @@ class FaceVerificationService:
                 logger.warning(f"OpenAI verification failed: {e}")
                 openai_reason = f"OpenAI error: {str(e)}"
         
-        # Try OpenCV face detection
-        if self.opencv_available and image is not None:
-            opencv_result = self._detect_face_opencv(image)
+        # Try OpenCV face detection (off the event loop)
+        if self.opencv_available:
+            opencv_result = await asyncio.to_thread(self._detect_face_in_bytes, image_bytes)
             logger.info(f"OpenCV face detection result: {opencv_result}")
         
         # Determine final result based on available methods
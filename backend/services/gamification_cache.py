@@ -0,0 +1,47 @@
+"""
+In-process cache of gamification points per user
+Lets write paths broadcast a points update without recomputing the whole profile
+"""
+
+import os
+import time
+from typing import Dict, Tuple
+from sqlalchemy.orm import Session
+
+from services.gamification_service import compute_points
+
+POINTS_TTL_SECONDS = 60.0
+MAX_CACHED_USERS = 10000
+# add_points/invalidate_points only reach this process, so with several workers
+# (run.py WORKERS) a cached total would go stale elsewhere; always recompute then
+CACHE_ENABLED = int(os.getenv("WORKERS", "1")) <= 1
+
+# user_id -> (expires_at, points)
+_points: Dict[str, Tuple[float, int]] = {}
+
+
+def get_cached_points(db: Session, user_id: str) -> int:
+    """Current points for a user, recomputed from the database at most once per TTL"""
+    if not CACHE_ENABLED:
+        return compute_points(db, user_id)
+    now = time.monotonic()
+    entry = _points.get(user_id)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    points = compute_points(db, user_id)
+    if len(_points) >= MAX_CACHED_USERS:
+        _points.clear()
+    _points[user_id] = (now + POINTS_TTL_SECONDS, points)
+    return points
+
+
+def add_points(user_id: str, delta: int) -> None:
+    """Apply a committed points change to a cached entry (a miss recomputes later anyway)"""
+    entry = _points.get(user_id)
+    if entry:
+        _points[user_id] = (entry[0], entry[1] + delta)
+
+
+def invalidate_points(user_id: str) -> None:
+    _points.pop(user_id, None)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text, func
@@ -226,9 +227,15 @@ def _compute_leaderboard_preview(db: Session, current_user: User) -> Tuple[List[
             scored.append((u, compute_points(db, u.id)))
         except Exception:
             continue
-    scored.sort(key=lambda tup: tup[1], reverse=True)
-    top5 = [{"rank": i + 1, "name": u.full_name, "points": pts} for i, (u, pts) in enumerate(scored[:5])]
-    rank = next((i + 1 for i, (u, _) in enumerate(scored) if u.id == current_user.id), len(scored) or 0)
+    # Only the top 5 are shown, so select them instead of sorting every citizen
+    top = heapq.nlargest(5, scored, key=lambda tup: tup[1])
+    top5 = [{"rank": i + 1, "name": u.full_name, "points": pts} for i, (u, pts) in enumerate(top)]
+    # Rank = 1 + citizens ahead in a stable descending sort (more points, or equal and listed earlier)
+    index = next((i for i, (u, _) in enumerate(scored) if u.id == current_user.id), None)
+    if index is None:
+        return top5, len(scored) or 0
+    own_points = scored[index][1]
+    rank = 1 + sum(1 for i, (_, pts) in enumerate(scored) if pts > own_points or (pts == own_points and i < index))
     return top5, rank
 
 
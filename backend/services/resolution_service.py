@@ -4,7 +4,7 @@ Handles report resolution with coordinate verification
 """
 
 import logging
-import json
+import orjson
 import math
 import os
 from sqlalchemy.orm import Session
@@ -19,6 +19,9 @@ from sqlalchemy import func
 
 logger = logging.getLogger(__name__)
 
+# Meters per degree of latitude (close enough to constant for small radii)
+METERS_PER_DEGREE_LAT = 111320.0
+
 class ResolutionService:
     def __init__(self):
         # Maximum distance in meters between original and resolution coordinates
@@ -72,6 +75,15 @@ class ResolutionService:
             logger.error(f"Error calculating distance: {e}")
             return float('inf')  # Return infinity if calculation fails
     
+    def bounding_box(self, lat: float, lon: float, radius_meters: float) -> Tuple[float, float]:
+        """
+        Half-widths (dlat, dlon) in degrees of a box that contains every point
+        within radius_meters of (lat, lon); points outside it can skip Haversine
+        """
+        dlat = radius_meters / METERS_PER_DEGREE_LAT
+        dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+        return dlat, dlon
+    
     async def verify_resolution_location(self, original_lat: float, original_lon: float,
                                        resolution_lat: float, resolution_lon: float) -> Tuple[bool, float]:
         """
@@ -146,13 +158,14 @@ class ResolutionService:
             else:
                 logger.info("Face verification is optional - skipping verification check")
 
-            # Read image content for EXIF extraction
-            image_content = await resolution_image.read()
+            # EXIF is read straight from the spooled upload (header only, no full copy)
+            image_file = resolution_image.file
+            image_file.seek(0)
             
             # Extract GPS coordinates strictly from the resolution image EXIF
             gps_data = None
             try:
-                gps_data = await extract_gps_from_image(image_content)
+                gps_data = await extract_gps_from_image(image_file)
                 logger.info(f"GPS data extracted from resolution image: {gps_data}")
             except Exception as e:
                 logger.warning(f"Failed to extract GPS from resolution image: {e}")
@@ -183,16 +196,16 @@ class ResolutionService:
                 )
             
             # Upload resolution image
-            await resolution_image.seek(0)  # Reset file pointer
-            resolution_image_url = await upload_image_to_storage(resolution_image, image_content)
+            image_file.seek(0)  # Reset file pointer
+            resolution_image_url = await upload_image_to_storage(resolution_image, image_file)
             
             # Store resolution coordinates as JSON
-            resolution_coords = json.dumps({
+            resolution_coords = orjson.dumps({
                 "latitude": resolution_lat,
                 "longitude": resolution_lon,
                 "distance_from_original_meters": round(distance, 2),
                 "coordinate_source": coordinate_source
-            })
+            }).decode()
             
             # Update report status using status service (special method for resolution)
             status_update = await status_service.resolve_report_with_evidence(
@@ -209,10 +222,11 @@ class ResolutionService:
             
             admin_verification_url = None
             if admin_verification_image is not None:
-                # Read and save admin verification selfie
-                selfie_bytes = await admin_verification_image.read()
+                # Save admin verification selfie, copied from the spooled upload
+                selfie_file = admin_verification_image.file
+                selfie_file.seek(0)
                 admin_verification_url = await upload_admin_verification_image(
-                    admin_verification_image, selfie_bytes, report_id, admin_user.id
+                    admin_verification_image, selfie_file, report_id, admin_user.id
                 )
 
                 # Persist admin verification record
@@ -254,10 +268,12 @@ class ResolutionService:
                 detail="Internal server error while resolving report"
             )
     
-    async def get_resolution_details(self, db: Session, report_id: int) -> Optional[Dict]:
-        """Get resolution details for a report"""
+    async def get_resolution_details(self, db: Session, report_id: int,
+                                     report: Optional[Report] = None) -> Optional[Dict]:
+        """Get resolution details for a report (pass `report` if the caller already loaded it)"""
         try:
-            report = db.query(Report).filter(Report.id == report_id).first()
+            if report is None:
+                report = db.query(Report).filter(Report.id == report_id).first()
             if not report or report.status != "resolved":
                 return None
             
@@ -265,8 +281,8 @@ class ResolutionService:
             resolution_coords = {}
             if report.resolution_coordinates:
                 try:
-                    resolution_coords = json.loads(report.resolution_coordinates)
-                except json.JSONDecodeError:
+                    resolution_coords = orjson.loads(report.resolution_coordinates)
+                except orjson.JSONDecodeError:
                     logger.warning(f"Invalid resolution coordinates JSON for report {report_id}")
             
             # Fetch latest admin verification for this report, if any
@@ -0,0 +1,114 @@
+"""
+In-process cache of the admin review aggregates and review listing
+Ratings change rarely, so dashboard loads reuse one computation until a new rating clears it
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Report, ReportRating, User
+
+REVIEW_STATS_TTL_SECONDS = 60.0
+CITIZEN_REVIEWS_TTL_SECONDS = 60.0
+
+# (expires_at, stats); stats is None when there are no ratings yet
+_stats: Optional[Tuple[float, Optional[Dict]]] = None
+
+# (expires_at, latest rating id seen, reviews without the department label)
+_reviews: Optional[Tuple[float, Optional[int], List[Dict]]] = None
+
+
+def compute_review_stats(db: Session) -> Optional[Dict]:
+    """Rating totals, distribution and per-category averages, aggregated in SQL"""
+    # Rating distribution: one row per star value
+    distribution_rows = db.query(
+        ReportRating.rating, func.count(ReportRating.id)
+    ).group_by(ReportRating.rating).all()
+    if not distribution_rows:
+        return None
+
+    rating_distribution = {i: 0 for i in range(1, 6)}
+    for rating, count in distribution_rows:
+        rating_distribution[rating] = count
+    total_reviews = sum(count for _, count in distribution_rows)
+    average_rating = sum(rating * count for rating, count in distribution_rows) / total_reviews
+
+    # Average rating per category (ratings whose report is gone are skipped)
+    category_ratings = {
+        category: float(average)
+        for category, average in db.query(
+            Report.category, func.avg(ReportRating.rating)
+        ).join(
+            Report, Report.id == ReportRating.report_id
+        ).group_by(Report.category).all()
+    }
+
+    return {
+        "total_reviews": total_reviews,
+        "average_rating": round(average_rating, 1),
+        "rating_distribution": rating_distribution,
+        "category_ratings": category_ratings,
+    }
+
+
+def get_cached_review_stats(db: Session) -> Optional[Dict]:
+    """Review aggregates, recomputed at most once per TTL (treat the result as read-only)"""
+    global _stats
+    now = time.monotonic()
+    if _stats and _stats[0] > now:
+        return _stats[1]
+
+    stats = compute_review_stats(db)
+    _stats = (now + REVIEW_STATS_TTL_SECONDS, stats)
+    return stats
+
+
+def invalidate_review_stats() -> None:
+    global _stats
+    _stats = None
+
+
+def compute_citizen_reviews(db: Session) -> List[Dict]:
+    """All ratings with their report and reporter, newest first"""
+    ratings = db.query(ReportRating, Report, User).join(
+        Report, ReportRating.report_id == Report.id
+    ).join(
+        User, Report.reporter_id == User.id
+    ).order_by(ReportRating.created_at.desc()).all()
+
+    reviews = []
+    for rating, report, user in ratings:
+        reviews.append({
+            "id": rating.id,
+            "report_id": rating.report_id,
+            "report_title": report.title,
+            "category": report.category,
+            "citizen_name": user.full_name,
+            "rating": rating.rating,
+            "feedback": rating.feedback,
+            "created_at": rating.created_at,
+            "resolved_at": report.resolved_at,
+            "resolved_by": report.resolved_by,
+        })
+    return reviews
+
+
+def get_cached_citizen_reviews(db: Session, department: str) -> List[Dict]:
+    """Review listing labelled with the admin's department, rebuilt when a newer rating exists or after the TTL"""
+    global _reviews
+    now = time.monotonic()
+    # MAX over the primary key is a single index probe
+    latest_rating_id = db.query(func.max(ReportRating.id)).scalar()
+    if _reviews and _reviews[0] > now and _reviews[1] == latest_rating_id:
+        reviews = _reviews[2]
+    else:
+        reviews = compute_citizen_reviews(db)
+        _reviews = (now + CITIZEN_REVIEWS_TTL_SECONDS, latest_rating_id, reviews)
+    return [{**review, "department": department} for review in reviews]
+
+
+def invalidate_citizen_reviews() -> None:
+    global _reviews
+    _reviews = None
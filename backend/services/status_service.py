@@ -4,9 +4,9 @@ Handles report status updates and history tracking
 """
 
 import logging
-import json
+import orjson
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from models import Report, ReportStatusHistory, User
 from sqlalchemy import func
 from datetime import datetime
@@ -203,8 +203,8 @@ class StatusService:
             history = []
             if report.status_history:
                 try:
-                    history = json.loads(report.status_history)
-                except json.JSONDecodeError:
+                    history = orjson.loads(report.status_history)
+                except orjson.JSONDecodeError:
                     history = []
             
             # Add new entry
@@ -216,11 +216,21 @@ class StatusService:
             })
             
             # Update the field
-            report.status_history = json.dumps(history)
+            report.status_history = orjson.dumps(history).decode()
             
         except Exception as e:
             logger.error(f"Error updating status history JSON: {e}")
     
+    @staticmethod
+    def _history_entry(entry: ReportStatusHistory) -> Dict:
+        return {
+            "id": entry.id,
+            "status": entry.status,
+            "changed_by": entry.changed_by,
+            "changed_at": entry.changed_at.isoformat(),
+            "notes": entry.notes
+        }
+    
     async def get_status_history(self, db: Session, report_id: int) -> List[Dict]:
         """Get status history for a report"""
         try:
@@ -228,25 +238,28 @@ class StatusService:
                 ReportStatusHistory.report_id == report_id
             ).order_by(ReportStatusHistory.changed_at.asc()).all()
             
-            return [
-                {
-                    "id": entry.id,
-                    "status": entry.status,
-                    "changed_by": entry.changed_by,
-                    "changed_at": entry.changed_at.isoformat(),
-                    "notes": entry.notes
-                }
-                for entry in history_entries
-            ]
+            return [self._history_entry(entry) for entry in history_entries]
             
         except Exception as e:
             logger.error(f"Error getting status history for report {report_id}: {e}")
             return []
     
-    async def get_report_status_timeline(self, db: Session, report_id: int) -> Dict:
-        """Get complete status timeline for a report"""
+    def get_status_history_with_owner(self, db: Session, report_id: int) -> Optional[Tuple[str, List[Dict]]]:
+        """Reporter id and status history of a report in one query; None if the report does not exist"""
+        rows = db.query(Report.reporter_id, ReportStatusHistory).outerjoin(
+            ReportStatusHistory, ReportStatusHistory.report_id == Report.id
+        ).filter(Report.id == report_id).order_by(ReportStatusHistory.changed_at.asc()).all()
+        
+        if not rows:
+            return None
+        return rows[0].reporter_id, [self._history_entry(entry) for _, entry in rows if entry is not None]
+    
+    async def get_report_status_timeline(self, db: Session, report_id: int,
+                                         report: Optional[Report] = None) -> Dict:
+        """Get complete status timeline for a report (pass `report` if the caller already loaded it)"""
         try:
-            report = db.query(Report).filter(Report.id == report_id).first()
+            if report is None:
+                report = db.query(Report).filter(Report.id == report_id).first()
             if not report:
                 return {}
             
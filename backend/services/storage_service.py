@@ -1,7 +1,9 @@
+import asyncio
 import os
+import shutil
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 import logging
 from fastapi import UploadFile
 from pathlib import Path
@@ -16,13 +18,14 @@ class StorageService:
         self.uploads_dir.mkdir(exist_ok=True)
         logger.info("Local storage service initialized successfully")
 
-    async def upload_file(self, file: UploadFile, file_content: bytes) -> str:
+    async def upload_file(self, file: UploadFile, file_content: Union[bytes, BinaryIO]) -> str:
         """
         Upload file to local storage.
         
         Args:
             file: FastAPI UploadFile object
-            file_content: File content as bytes
+            file_content: File content as bytes, or a binary file positioned at the start
+                (copied in chunks)
         
         Returns:
             URL of the uploaded file
@@ -40,7 +43,10 @@ class StorageService:
             # Save file locally
             file_path = date_dir / unique_filename
             with open(file_path, 'wb') as f:
-                f.write(file_content)
+                if isinstance(file_content, (bytes, bytearray)):
+                    f.write(file_content)
+                else:
+                    shutil.copyfileobj(file_content, f)
             
             # Return local file URL (use forward slashes for URLs)
             file_url = f"/uploads/{date_folder}/{unique_filename}"
@@ -53,7 +59,7 @@ class StorageService:
             # Fallback to placeholder URL
             return "https://placeholder.com/image.jpg"
 
-    async def upload_admin_verification(self, file: UploadFile, file_content: bytes,
+    async def upload_admin_verification(self, file: UploadFile, file_content: Union[bytes, BinaryIO],
                                         report_id: int, admin_id: str) -> str:
         """
         Save admin verification selfie under uploads/admin_verifications with deterministic name.
@@ -74,7 +80,10 @@ class StorageService:
             filename = f"{report_id}_{admin_id}{ext}"
             file_path = target_dir / filename
             with open(file_path, 'wb') as f:
-                f.write(file_content)
+                if isinstance(file_content, (bytes, bytearray)):
+                    f.write(file_content)
+                else:
+                    shutil.copyfileobj(file_content, f)
 
             # URL uses forward slashes
             return f"/uploads/admin_verifications/{filename}"
@@ -88,11 +97,10 @@ class StorageService:
             target_dir = self.uploads_dir / "admin_verifications"
             target_dir.mkdir(parents=True, exist_ok=True)
 
-            # Write as JPEG
+            # Write as JPEG (in a worker thread; webcam captures can be several MB)
             filename = f"{report_id}_{who_id}.jpg"
             file_path = target_dir / filename
-            with open(file_path, 'wb') as f:
-                f.write(image_bytes)
+            await asyncio.to_thread(file_path.write_bytes, image_bytes)
 
             return f"/uploads/admin_verifications/{filename}"
         except Exception as e:
@@ -125,7 +133,7 @@ class StorageService:
 # Global storage service instance
 storage_service = StorageService()
 
-async def upload_image_to_storage(file: UploadFile, file_content: bytes) -> str:
+async def upload_image_to_storage(file: UploadFile, file_content: Union[bytes, BinaryIO]) -> str:
     """
     Upload image to storage and return URL.
     
@@ -138,7 +146,7 @@ async def upload_image_to_storage(file: UploadFile, file_content: bytes) -> str:
     """
     return await storage_service.upload_file(file, file_content)
 
-async def upload_admin_verification_image(file: UploadFile, file_content: bytes,
+async def upload_admin_verification_image(file: UploadFile, file_content: Union[bytes, BinaryIO],
                                           report_id: int, admin_id: str) -> str:
     """Helper to save admin verification selfie and return URL path."""
     return await storage_service.upload_admin_verification(file, file_content, report_id, admin_id)
@@ -0,0 +1,27 @@
+"""
+Tuned SQLite connections shared by the local maintenance scripts
+"""
+import sqlite3
+from contextlib import contextmanager
+
+DEFAULT_DB_PATH = 'crowdcare.db'
+
+# Applied once per connection: WAL persists in the file, the rest are per-connection
+TUNING_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+@contextmanager
+def tuned_conn(path: str = DEFAULT_DB_PATH, **connect_kwargs):
+    """Open a SQLite connection with the tuning PRAGMAs applied, closed on exit"""
+    conn = sqlite3.connect(path, **connect_kwargs)
+    try:
+        for pragma in TUNING_PRAGMAS:
+            conn.execute(pragma)
+        yield conn
+    finally:
+        conn.close()
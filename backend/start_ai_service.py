@@ -32,6 +32,9 @@ if __name__ == "__main__":
         host=host,
         port=port,
         workers=workers,
+        # uvloop/httptools ship with uvicorn[standard]; uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         reload=False,  # Set to True for development
         log_level="info"
     )
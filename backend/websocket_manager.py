@@ -3,57 +3,128 @@ WebSocket Manager for Real-time Updates
 Handles WebSocket connections and broadcasting status updates
 """
 
-import json
+import asyncio
 import logging
-from typing import Dict, List, Set
+import weakref
+import orjson
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Connection limits; connections over a limit are closed with 1013 (try again later).
+# The per-user limit applies to each channel (endpoint) separately and leaves room for
+# several open tabs of the same page
+MAX_CONNECTIONS = 10000
+MAX_CONNECTIONS_PER_USER = 20
+# Idle time after which the server pings the client; a failed send drops the connection
+KEEPALIVE_SECONDS = 30.0
+PING_MESSAGE = orjson.dumps({"type": "ping"}).decode()
+
 class ConnectionManager:
     def __init__(self):
         # Store active connections by user ID
         self.active_connections: Dict[str, Set[WebSocket]] = {}
-        # Store connections by report ID for targeted updates
-        self.report_connections: Dict[int, Set[WebSocket]] = {}
+        # Store connections by report ID for targeted updates; sockets are held weakly
+        # so one that was never cleanly disconnected can still be garbage collected
+        self.report_connections: Dict[int, weakref.WeakSet] = defaultdict(weakref.WeakSet)
+        # Reports each socket subscribed to, so disconnect only touches those buckets
+        self._socket_reports = weakref.WeakKeyDictionary()
+        # Number of sockets across all users in active_connections
+        self.connection_count = 0
+        # Channel of each socket, and socket counts per (user, channel) for the per-user limit
+        self._socket_channels: Dict[WebSocket, str] = {}
+        self._channel_counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        report_ids: List[int] = None,
+        channel: str = "updates",
+        subprotocol: Optional[str] = None,
+    ) -> bool:
+        """Accept a WebSocket connection and register it; returns False if it was refused"""
+        await websocket.accept(subprotocol=subprotocol)
         
-    async def connect(self, websocket: WebSocket, user_id: str, report_ids: List[int] = None):
-        """Accept a WebSocket connection and register it"""
-        await websocket.accept()
+        channel_key = (user_id, channel)
+        if self.connection_count >= MAX_CONNECTIONS or self._channel_counts.get(channel_key, 0) >= MAX_CONNECTIONS_PER_USER:
+            logger.warning(f"WebSocket refused for user {user_id}: connection limit reached")
+            await websocket.close(code=1013)
+            return False
         
         # Add to user connections
         if user_id not in self.active_connections:
             self.active_connections[user_id] = set()
         self.active_connections[user_id].add(websocket)
+        self.connection_count += 1
+        self._socket_channels[websocket] = channel
+        self._channel_counts[channel_key] += 1
         
         # Add to report connections if specified
         if report_ids:
-            for report_id in report_ids:
-                if report_id not in self.report_connections:
-                    self.report_connections[report_id] = set()
-                self.report_connections[report_id].add(websocket)
+            self.subscribe(websocket, report_ids)
         
         logger.info(f"WebSocket connected for user {user_id}")
+        return True
+    
+    async def receive_text(self, websocket: WebSocket) -> Optional[str]:
+        """Wait for the next client message; after KEEPALIVE_SECONDS idle, ping and return None"""
+        try:
+            return await asyncio.wait_for(websocket.receive_text(), timeout=KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            await websocket.send_text(PING_MESSAGE)
+            return None
+    
+    def subscribe(self, websocket: WebSocket, report_ids: List[int]):
+        """Register a connection for updates on the given reports"""
+        for report_id in report_ids:
+            self.report_connections[report_id].add(websocket)
+        self._socket_reports.setdefault(websocket, set()).update(report_ids)
     
     def disconnect(self, websocket: WebSocket, user_id: str, report_ids: List[int] = None):
         """Remove a WebSocket connection"""
         # Remove from user connections
-        if user_id in self.active_connections:
-            self.active_connections[user_id].discard(websocket)
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
+        self._remove_user_connection(user_id, websocket)
         
-        # Remove from report connections
+        # Remove from every report this socket subscribed to
+        subscribed = self._socket_reports.pop(websocket, set())
         if report_ids:
-            for report_id in report_ids:
-                if report_id in self.report_connections:
-                    self.report_connections[report_id].discard(websocket)
-                    if not self.report_connections[report_id]:
-                        del self.report_connections[report_id]
+            subscribed.update(report_ids)
+        for report_id in subscribed:
+            connections = self.report_connections.get(report_id)
+            if connections is not None:
+                connections.discard(websocket)
+                if not connections:
+                    del self.report_connections[report_id]
         
         logger.info(f"WebSocket disconnected for user {user_id}")
     
+    def _remove_user_connection(self, user_id: str, websocket: WebSocket):
+        user_connections = self.active_connections.get(user_id)
+        if user_connections is not None and websocket in user_connections:
+            user_connections.discard(websocket)
+            self.connection_count -= 1
+            channel_key = (user_id, self._socket_channels.pop(websocket, "updates"))
+            self._channel_counts[channel_key] -= 1
+            if self._channel_counts[channel_key] <= 0:
+                del self._channel_counts[channel_key]
+            if not user_connections:
+                del self.active_connections[user_id]
+    
+    def sweep_report_connections(self):
+        """Drop report buckets emptied by garbage-collected sockets"""
+        for report_id in [rid for rid, connections in self.report_connections.items() if not connections]:
+            del self.report_connections[report_id]
+    
+    async def run_sweeper(self, interval_seconds: float = 60.0):
+        """Background loop that periodically sweeps empty report buckets"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            self.sweep_report_connections()
+    
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """Send a message to a specific WebSocket connection"""
         try:
@@ -61,39 +132,40 @@ class ConnectionManager:
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
     
+    async def _send_to_all(self, websockets: List[WebSocket], message_str: str) -> List[WebSocket]:
+        """Send one serialized message to every socket concurrently; returns the ones that failed"""
+        results = await asyncio.gather(
+            *(websocket.send_text(message_str) for websocket in websockets),
+            return_exceptions=True
+        )
+        failed = []
+        for websocket, result in zip(websockets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error broadcasting message: {result}")
+                failed.append(websocket)
+        return failed
+    
     async def broadcast_to_user(self, user_id: str, message: dict):
         """Broadcast a message to all connections of a specific user"""
         if user_id in self.active_connections:
-            message_str = json.dumps(message)
-            disconnected = set()
-            
-            for websocket in self.active_connections[user_id]:
-                try:
-                    await websocket.send_text(message_str)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to user {user_id}: {e}")
-                    disconnected.add(websocket)
+            message_str = orjson.dumps(message).decode()
+            disconnected = await self._send_to_all(list(self.active_connections[user_id]), message_str)
             
             # Clean up disconnected connections
             for websocket in disconnected:
-                self.active_connections[user_id].discard(websocket)
+                self._remove_user_connection(user_id, websocket)
     
     async def broadcast_to_report(self, report_id: int, message: dict):
         """Broadcast a message to all connections watching a specific report"""
-        if report_id in self.report_connections:
-            message_str = json.dumps(message)
-            disconnected = set()
-            
-            for websocket in self.report_connections[report_id]:
-                try:
-                    await websocket.send_text(message_str)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to report {report_id}: {e}")
-                    disconnected.add(websocket)
+        connections = self.report_connections.get(report_id)
+        if connections:
+            message_str = orjson.dumps(message).decode()
+            # Snapshot: the bucket can change while the sends are awaited
+            disconnected = await self._send_to_all(list(connections), message_str)
             
             # Clean up disconnected connections
             for websocket in disconnected:
-                self.report_connections[report_id].discard(websocket)
+                connections.discard(websocket)
     
     async def broadcast_status_update(self, report_id: int, old_status: str, new_status: str, 
                                     changed_by: str, timestamp: str, notes: str = None):
@@ -160,6 +232,36 @@ class ConnectionManager:
         await self.broadcast_to_report(report_id, message)
         logger.info(f"Broadcasted new comment for report {report_id} by {user_id}")
 
+    async def broadcast_report_enriched(self, report_id: int, user_id: str, title: str, description: str,
+                                        urgency_score: float, urgency_label: str):
+        """Broadcast the AI-generated summary and urgency of a newly created report
+        to the reporter and to listeners of the report."""
+        message = {
+            "type": "report_enriched",
+            "report_id": report_id,
+            "title": title,
+            "description": description,
+            "urgency_score": urgency_score,
+            "urgency_label": urgency_label,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        message_str = orjson.dumps(message).decode()
+        
+        # Serialize once and send once per socket, even when the reporter's socket
+        # is also subscribed to the report
+        user_connections = self.active_connections.get(user_id, set())
+        report_connections = self.report_connections.get(report_id)
+        targets = list(set(user_connections).union(report_connections or ()))
+        if targets:
+            disconnected = await self._send_to_all(targets, message_str)
+            
+            # Clean up disconnected connections
+            for websocket in disconnected:
+                self._remove_user_connection(user_id, websocket)
+                if report_connections is not None:
+                    report_connections.discard(websocket)
+        logger.info(f"Broadcasted AI enrichment for report {report_id}: {urgency_label}")
+
     async def broadcast_gamification_event(self, user_id: str, event: dict):
         """Broadcast a gamification event to a specific user.
         Example events:
@@ -4,7 +4,6 @@ import { Input } from '@/components/ui/input';
 import { Button } from '@/components/ui/button';
 import { MessageCircle } from 'lucide-react';
 import { formatISTDateTime } from '@/lib/utils';
-import { useWebSocket } from '@/hooks/useWebSocket';
 
 interface CommentItem {
   id: number;
@@ -15,19 +14,31 @@ interface CommentItem {
   created_at: string;
 }
 
+export interface CommentNewMessage {
+  report_id?: number;
+  comment_id?: number;
+  user_id?: string;
+  user_name?: string;
+  comment?: string;
+  created_at?: string;
+}
+
+// Registers a comment_new handler for one report on the parent's socket; returns an unsubscribe
+export type SubscribeComments = (reportId: number, handler: (msg: CommentNewMessage) => void) => () => void;
+
 interface CommentsBoxProps {
   reportId: number;
+  subscribe: SubscribeComments;
 }
 
-export function CommentsBox({ reportId }: CommentsBoxProps) {
+export function CommentsBox({ reportId, subscribe }: CommentsBoxProps) {
   const [comments, setComments] = useState<CommentItem[]>([]);
   const [newComment, setNewComment] = useState('');
   const [isSubmitting, setIsSubmitting] = useState(false);
 
-  const { subscribeToReports } = useWebSocket({
-    reportIds: [reportId],
-    onCommentNew: (msg) => {
-      if (msg.report_id !== reportId) return;
+  // Live comments arrive over the feed's socket instead of a socket per comments box
+  useEffect(() => {
+    return subscribe(reportId, (msg) => {
       setComments((prev) => [
         {
           id: msg.comment_id!,
@@ -39,12 +50,11 @@ export function CommentsBox({ reportId }: CommentsBoxProps) {
         },
         ...prev,
       ]);
-    },
-  });
+    });
+  }, [reportId, subscribe]);
 
   useEffect(() => {
     apiService.getComments(reportId).then(setComments).catch(() => {});
-    subscribeToReports([reportId]);
   }, [reportId]);
 
   const handleSubmit = async () => {
@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from 'react';
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { apiService } from '@/lib/api';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
@@ -6,7 +6,7 @@ import { MessageCircle } from 'lucide-react';
 import { formatISTDateTime, absoluteMediaUrl } from '@/lib/utils';
 import { UpvoteButton } from '@/components/UpvoteButton';
 import { useWebSocket } from '@/hooks/useWebSocket';
-import { CommentsBox } from '@/components/CommentsBox';
+import { CommentsBox, type CommentNewMessage, type SubscribeComments } from '@/components/CommentsBox';
 
 type CommunityItem = {
   id: number;
@@ -34,6 +34,18 @@ export function CommunityFeed({ highlightId }: { highlightId?: number }) {
 
   const reportIds = useMemo(() => items.map(i => i.id), [items]);
 
+  // comment_new handlers of the open comment boxes, keyed by report id
+  const commentHandlers = useRef(new Map<number, Set<(msg: CommentNewMessage) => void>>());
+  const subscribeComments = useCallback<SubscribeComments>((reportId, handler) => {
+    const handlers = commentHandlers.current.get(reportId) ?? new Set();
+    handlers.add(handler);
+    commentHandlers.current.set(reportId, handlers);
+    return () => {
+      handlers.delete(handler);
+      if (handlers.size === 0) commentHandlers.current.delete(reportId);
+    };
+  }, []);
+
   const { subscribeToReports } = useWebSocket({
     reportIds,
     onUpvoteUpdate: (msg) => {
@@ -41,6 +53,7 @@ export function CommunityFeed({ highlightId }: { highlightId?: number }) {
     },
     onCommentNew: (msg) => {
       setItems(prev => prev.map(i => i.id === msg.report_id ? { ...i, comments_count: (i.comments_count || 0) + 1 } : i));
+      commentHandlers.current.get(msg.report_id!)?.forEach(handler => handler(msg));
     }
   });
 
@@ -164,7 +177,7 @@ export function CommunityFeed({ highlightId }: { highlightId?: number }) {
             </div>
             {expandedComments[item.id] && (
               <div className="mt-4">
-                <CommentsBox reportId={item.id} />
+                <CommentsBox reportId={item.id} subscribe={subscribeComments} />
               </div>
             )}
           </CardContent>
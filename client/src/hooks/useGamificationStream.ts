@@ -1,5 +1,6 @@
 import { useEffect, useRef, useState } from 'react';
 import { useAuth } from './useAuth';
+import { websocketAuthProtocols } from './useWebSocket';
 
 export type GamificationEvent =
   | { type: 'hello'; channel: 'gamification'; connected: boolean }
@@ -19,7 +20,7 @@ export function useGamificationStream(options?: {
     if (!user?.id) return;
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
     const wsUrl = `${protocol}//${window.location.host}/gamification/stream?user_id=${encodeURIComponent(user.id)}`;
-    const ws = new WebSocket(wsUrl);
+    const ws = new WebSocket(wsUrl, websocketAuthProtocols());
     wsRef.current = ws;
 
     ws.onopen = () => setConnected(true);
@@ -35,6 +35,12 @@ interface UseWebSocketOptions {
   onCommentNew?: (message: WebSocketMessage) => void;
 }
 
+// Subprotocols carrying the access token: ["bearer", <token>]
+export function websocketAuthProtocols(): string[] {
+  const token = localStorage.getItem('access_token');
+  return token ? ['bearer', token] : [];
+}
+
 export function useWebSocket(options: UseWebSocketOptions = {}) {
   const { user } = useAuth();
   const [isConnected, setIsConnected] = useState(false);
@@ -52,7 +58,9 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
       const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
       const wsUrl = `${protocol}//${window.location.host}/ws/${user.id}`;
       
-      wsRef.current = new WebSocket(wsUrl);
+      // The server authenticates the socket with the access token, offered as a
+      // subprotocol so it stays out of URLs and access logs
+      wsRef.current = new WebSocket(wsUrl, websocketAuthProtocols());
 
       wsRef.current.onopen = () => {
         console.log('WebSocket connected');